@@ -10,42 +10,90 @@ Usage:
     if is_debug_enabled('MATH_SOLVER'):
         # Expensive debug operation
         pass
+
+Hot loops can import a per-category constant instead, which turns the
+check into a plain name lookup and skips building the log arguments:
+    from debug_logger import DEBUG_MATH_FAST_PATH
+    if DEBUG_MATH_FAST_PATH:
+        debug_log('MATH_FAST_PATH', f'Step: {expensive_repr()}')
 """
 
 import os
+from functools import lru_cache
 from typing import Any, Optional
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
-
-# Check if master debug is enabled
-DEBUG_ALL = os.getenv('DEBUG_ALL', 'false').lower() == 'true'
-
-# Debug flag mappings
-DEBUG_FLAGS = {
+# Debug categories, each toggled by a DEBUG_<CATEGORY> environment variable.
+# Flags are read lazily on first use rather than at import time.
+DEBUG_CATEGORIES = (
     # OCR Server
-    'OCR_SERVER': os.getenv('DEBUG_OCR_SERVER', 'false').lower() == 'true' or DEBUG_ALL,
-    'OCR_SAVE_IMAGES': os.getenv('DEBUG_OCR_SAVE_IMAGES', 'false').lower() == 'true' or DEBUG_ALL,
-    'TROCR_MODEL': os.getenv('DEBUG_TROCR_MODEL', 'false').lower() == 'true' or DEBUG_ALL,
+    'OCR_SERVER',
+    'OCR_SAVE_IMAGES',
+    'TROCR_MODEL',
     
     # Math Server
-    'MATH_SERVER': os.getenv('DEBUG_MATH_SERVER', 'false').lower() == 'true' or DEBUG_ALL,
-    'MATH_FAST_PATH': os.getenv('DEBUG_MATH_FAST_PATH', 'false').lower() == 'true' or DEBUG_ALL,
-    'MATH_SLOW_PATH': os.getenv('DEBUG_MATH_SLOW_PATH', 'false').lower() == 'true' or DEBUG_ALL,
-    'MATH_CLASSIFICATION': os.getenv('DEBUG_MATH_CLASSIFICATION', 'false').lower() == 'true' or DEBUG_ALL,
-    'MATH_HISTORY': os.getenv('DEBUG_MATH_HISTORY', 'false').lower() == 'true' or DEBUG_ALL,
+    'MATH_SERVER',
+    'MATH_FAST_PATH',
+    'MATH_SLOW_PATH',
+    'MATH_CLASSIFICATION',
+    'MATH_HISTORY',
     
     # Equation Solving
-    'EQUATION_CLASSIFIER': os.getenv('DEBUG_EQUATION_CLASSIFIER', 'false').lower() == 'true' or DEBUG_ALL,
-    'SMART_MATH_ENGINE': os.getenv('DEBUG_SMART_MATH_ENGINE', 'false').lower() == 'true' or DEBUG_ALL,
-    'FAST_MATH_SOLVER': os.getenv('DEBUG_FAST_MATH_SOLVER', 'false').lower() == 'true' or DEBUG_ALL,
-    'PHYSICS_SOLVER': os.getenv('DEBUG_PHYSICS_SOLVER', 'false').lower() == 'true' or DEBUG_ALL,
+    'EQUATION_CLASSIFIER',
+    'SMART_MATH_ENGINE',
+    'FAST_MATH_SOLVER',
+    'PHYSICS_SOLVER',
     
     # Server Health & Monitoring
-    'SERVER_HEALTH': os.getenv('DEBUG_SERVER_HEALTH', 'false').lower() == 'true' or DEBUG_ALL,
-    'SERVER_STATS': os.getenv('DEBUG_SERVER_STATS', 'false').lower() == 'true' or DEBUG_ALL,
-}
+    'SERVER_HEALTH',
+    'SERVER_STATS',
+)
+
+# Output prefixes built once per category instead of formatted per call
+_PREFIXES = {category: f'[{category}]' for category in DEBUG_CATEGORIES}
+_WARN_PREFIXES = {category: f'[{category}] WARNING:' for category in DEBUG_CATEGORIES}
+_ERROR_PREFIXES = {category: f'[{category}] ERROR:' for category in DEBUG_CATEGORIES}
+
+
+def _env_flag(name: str) -> bool:
+    """Read a boolean 'true'/'false' environment variable."""
+    return os.getenv(name, 'false').lower() == 'true'
+
+
+def _load_env_file() -> None:
+    """
+    Load .env (variables already in the environment are not overridden).
+    
+    Deployments that configure everything through the environment (Docker,
+    systemd) can set SKIP_DOTENV=1 to skip the file search and parse.
+    DOTENV_PATH points at a specific file instead of searching for one.
+    """
+    if os.getenv('SKIP_DOTENV') == '1':
+        return
+    
+    dotenv_path = os.getenv('DOTENV_PATH')
+    if dotenv_path is None:
+        load_dotenv()
+    elif os.path.isfile(dotenv_path):
+        load_dotenv(dotenv_path)
+
+
+@lru_cache(maxsize=None)
+def _debug_all() -> bool:
+    """Check the master DEBUG_ALL switch, loading .env on first use."""
+    _load_env_file()
+    return _env_flag('DEBUG_ALL')
+
+
+@lru_cache(maxsize=None)
+def _enabled_categories() -> frozenset:
+    """Resolve the set of enabled categories once, on first use."""
+    if _debug_all():
+        return frozenset(DEBUG_CATEGORIES)
+    return frozenset(
+        category for category in DEBUG_CATEGORIES
+        if _env_flag(f'DEBUG_{category}')
+    )
 
 
 def is_debug_enabled(category: str) -> bool:
@@ -58,7 +106,26 @@ def is_debug_enabled(category: str) -> bool:
     Returns:
         True if debug is enabled for this category
     """
-    return DEBUG_FLAGS.get(category, False)
+    return category in _enabled_categories()
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Resolve DEBUG_<CATEGORY> constants, DEBUG_ALL and the DEBUG_FLAGS
+    category -> enabled mapping on first access (PEP 562).
+    """
+    category = name[len('DEBUG_'):]
+    if name == 'DEBUG_FLAGS':
+        enabled = _enabled_categories()
+        value = {flag: flag in enabled for flag in DEBUG_CATEGORIES}
+    elif name == 'DEBUG_ALL':
+        value = _debug_all()
+    elif name.startswith('DEBUG_') and category in DEBUG_CATEGORIES:
+        value = category in _enabled_categories()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value  # Later lookups skip this hook entirely
+    return value
 
 
 def debug_log(category: str, *args: Any, **kwargs: Any) -> None:
@@ -70,8 +137,8 @@ def debug_log(category: str, *args: Any, **kwargs: Any) -> None:
         *args: Arguments to print
         **kwargs: Keyword arguments for print()
     """
-    if is_debug_enabled(category):
-        print(f"[{category}]", *args, **kwargs)
+    if category in _enabled_categories():
+        print(_PREFIXES[category], *args, **kwargs)
 
 
 def debug_warn(category: str, *args: Any, **kwargs: Any) -> None:
@@ -83,8 +150,8 @@ def debug_warn(category: str, *args: Any, **kwargs: Any) -> None:
         *args: Arguments to print
         **kwargs: Keyword arguments for print()
     """
-    if is_debug_enabled(category):
-        print(f"[{category}] WARNING:", *args, **kwargs)
+    if category in _enabled_categories():
+        print(_WARN_PREFIXES[category], *args, **kwargs)
 
 
 def debug_error(category: str, *args: Any, **kwargs: Any) -> None:
@@ -96,8 +163,8 @@ def debug_error(category: str, *args: Any, **kwargs: Any) -> None:
         *args: Arguments to print
         **kwargs: Keyword arguments for print()
     """
-    if is_debug_enabled(category):
-        print(f"[{category}] ERROR:", *args, **kwargs)
+    if category in _enabled_categories():
+        print(_ERROR_PREFIXES[category], *args, **kwargs)
 
 
 def get_enabled_debug_flags() -> list[str]:
@@ -107,7 +174,7 @@ def get_enabled_debug_flags() -> list[str]:
     Returns:
         List of enabled debug category names
     """
-    return [key for key, value in DEBUG_FLAGS.items() if value]
+    return [category for category in DEBUG_CATEGORIES if is_debug_enabled(category)]
 
 
 def print_debug_config() -> None:
@@ -115,7 +182,7 @@ def print_debug_config() -> None:
     enabled = get_enabled_debug_flags()
     if not enabled:
         print('[DEBUG] No debug flags enabled')
-    elif DEBUG_ALL:
+    elif _debug_all():
         print('[DEBUG] ALL debug flags enabled')
     else:
         print('[DEBUG] Enabled flags:', ', '.join(enabled))
@@ -130,4 +197,5 @@ __all__ = [
     'get_enabled_debug_flags',
     'print_debug_config',
     'DEBUG_FLAGS',
+    'DEBUG_CATEGORIES',
 ]
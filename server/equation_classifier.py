@@ -3,7 +3,101 @@ Equation Classifier - Automatically detect the type of mathematical problem
 """
 
 import re
-from typing import Dict, List, Optional, Tuple
+import string
+import sys
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import ahocorasick  # Optional: single-pass multi-keyword scanning
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan  # Optional: all-patterns-at-once DFA scanning
+except ImportError:
+    hyperscan = None
+
+try:
+    # Optional: Cython build of score_patterns (cythonize -i equation_classifier_core.pyx)
+    from equation_classifier_core import score_patterns
+except ImportError:
+    def score_patterns(patterns, text: str) -> int:
+        """Count how many compiled patterns match somewhere in text"""
+        score = 0
+        for pattern in patterns:
+            if pattern.search(text):
+                score += 1
+        return score
+
+# One bit per ASCII letter (a-z, then A-Z) for the variable bitmask
+_LETTER_BITS = {c: 1 << i for i, c in enumerate(string.ascii_letters)}
+_EXCLUDED_VARIABLES_MASK = sum(_LETTER_BITS[c] for c in 'aiAIeE')
+
+
+_ESCAPE_RE = re.compile(r'\\.')
+
+
+def _case_flags(pattern: str) -> int:
+    """IGNORECASE only when the pattern has letters to fold (escapes ignored)"""
+    literal = _ESCAPE_RE.sub('', pattern)
+    return re.IGNORECASE if any(ch.isalpha() for ch in literal) else 0
+
+
+def _is_literal(pattern: str) -> bool:
+    """True for plain substrings with no regex metacharacters"""
+    return re.escape(pattern).replace('\\ ', ' ') == pattern
+
+
+def _collect_match(pattern_id: int, start: int, end: int, flags: int, matched: set) -> None:
+    """Hyperscan match callback: record which pattern ids fired"""
+    matched.add(pattern_id)
+
+
+def _is_word_char(ch: str) -> bool:
+    """Match the regex notion of a word character (\\w)"""
+    return ch.isalnum() or ch == '_'
+
+
+@dataclass(frozen=True, slots=True)
+class ClassificationResult:
+    """
+    Immutable classification of a single input, safe to share from the cache.
+    Supports dict-style reads (result['problem_type']) for existing callers.
+    """
+    problem_type: str
+    operation: str
+    equation: str
+    variables: Tuple[str, ...]
+    solve_for: Optional[str]
+    limits: Optional[Tuple[float, float]]
+    confidence: float
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict copy, e.g. for JSON serialization"""
+        return asdict(self)
+
+
+# What classify() produces for empty or whitespace-only input
+_EMPTY_RESULT = ClassificationResult(
+    problem_type='algebra',
+    operation='solve',
+    equation='',
+    variables=(),
+    solve_for=None,
+    limits=None,
+    confidence=0.5
+)
 
 
 class EquationClassifier:
@@ -11,8 +105,38 @@ class EquationClassifier:
     Automatically classify mathematical equations and determine the appropriate solving strategy
     """
     
+    __slots__ = (
+        'patterns',
+        'literals',
+        'equation_patterns',
+        'category_res',
+        'operation_keywords',
+        'operation_res',
+        '_op_automaton',
+        '_hs_db',
+        '_hs_targets',
+        '_hs_type_names',
+        '_hs_operation_names',
+        '_classify_cached',
+    )
+    
+    # Solve-for phrases and limit forms, fused into a single finditer pass.
+    # Variable letters and bracket contents sit in lookaheads so they are not
+    # consumed and can't hide a later match.
+    EXTRACTION_RE = re.compile(
+        r'(?P<solve_for>(?i:solve for)\s+(?=(?P<solve_for_var>[a-zA-Z])))'
+        r'|(?P<find>(?i:find)\s+(?=(?P<find_var>[a-zA-Z])))'
+        r'|(?P<what_is>(?i:what is)\s+(?=(?P<what_is_var>[a-zA-Z])))'
+        r'|(?P<range>(?:from|between)\s+(?P<range_lo>[-\d.]+)\s+(?:to|and)\s+(?P<range_hi>[-\d.]+))'
+        r'|(?P<bracket>\[(?=(?P<bracket_lo>[^,]+),\s*(?P<bracket_hi>[^\]]+)\]))'
+    )
+    SOLVE_FOR_KINDS = ('solve_for', 'find', 'what_is')  # In priority order
+    QUESTION_WORDS_RE = re.compile(r'(solve|find|calculate|what is|determine)\s+', re.IGNORECASE)
+    SOLVE_TARGET_RE = re.compile(r'(for|the value of)\s+[a-zA-Z]\s*', re.IGNORECASE)
+    
     def __init__(self):
-        self.patterns = {
+        # Free-text patterns: keywords and notation that can appear anywhere
+        patterns = {
             'calculus_derivative': [
                 r'd[xy]/d[xy]',
                 r'\\frac\{d',
@@ -36,23 +160,15 @@ class EquationClassifier:
                 r'tends to'
             ],
             'physics_kinematics': [
-                r'\bv\s*=\s*u\s*\+\s*a\s*\*?\s*t\b',
-                r'\bs\s*=\s*u\s*\*?\s*t\s*\+',
-                r'\bv\s*\*\*?\s*2\s*=\s*u\s*\*\*?\s*2',
                 r'velocity|acceleration|displacement'
             ],
             'physics_force': [
-                r'\bF\s*=\s*m\s*\*?\s*a\b',
                 r'force|newton|mass.*acceleration'
             ],
             'physics_energy': [
-                r'\bE\s*=\s*m\s*\*?\s*c\s*\*\*?\s*2',
-                r'KE\s*=|PE\s*=',
                 r'kinetic|potential.*energy'
             ],
             'physics_electricity': [
-                r'\bV\s*=\s*I\s*\*?\s*R\b',
-                r'\bP\s*=\s*V\s*\*?\s*I\b',
                 r'voltage|current|resistance|ohm'
             ],
             'statistics': [
@@ -74,10 +190,64 @@ class EquationClassifier:
             ],
             'algebra': [
                 r'solve|find|calculate',
-                r'=.*[a-z]',  # equations with variables
             ]
         }
         
+        # Equation templates: every one needs a literal '=', so they are only
+        # tried when the input contains one
+        equation_patterns = {
+            'physics_kinematics': [
+                r'\bv\s*=\s*u\s*\+\s*a\s*\*?\s*t\b',
+                r'\bs\s*=\s*u\s*\*?\s*t\s*\+',
+                r'\bv\s*\*\*?\s*2\s*=\s*u\s*\*\*?\s*2',
+            ],
+            'physics_force': [
+                r'\bF\s*=\s*m\s*\*?\s*a\b',
+            ],
+            'physics_energy': [
+                r'\bE\s*=\s*m\s*\*?\s*c\s*\*\*?\s*2',
+                r'KE\s*=|PE\s*=',
+            ],
+            'physics_electricity': [
+                r'\bV\s*=\s*I\s*\*?\s*R\b',
+                r'\bP\s*=\s*V\s*\*?\s*I\b',
+            ],
+            'algebra': [
+                r'=.*[a-z]',  # equations with variables
+            ],
+        }
+        all_patterns = {
+            prob_type: pats + equation_patterns.get(prob_type, [])
+            for prob_type, pats in patterns.items()
+        }
+        
+        # Compile every pattern once instead of on each classify() call.
+        # Matching runs on the original text, so case folding is done by the
+        # regex engine and only for patterns that contain letters.
+        # Plain-substring patterns skip the regex engine entirely and are
+        # tested with 'in' against lowercased text.
+        self.patterns = {
+            sys.intern(prob_type): tuple(
+                re.compile(p, _case_flags(p)) for p in pats if not _is_literal(p)
+            )
+            for prob_type, pats in patterns.items()
+        }
+        self.literals = {
+            prob_type: tuple(p.lower() for p in pats if _is_literal(p))
+            for prob_type, pats in patterns.items()
+        }
+        self.equation_patterns = {
+            prob_type: tuple(re.compile(p, _case_flags(p)) for p in equation_patterns.get(prob_type, ()))
+            for prob_type in patterns
+        }
+        
+        # One alternation per category: a single C-level scan rules out
+        # categories with no match before any per-pattern scoring happens
+        self.category_res = {
+            prob_type: re.compile('|'.join(f'(?:{p})' for p in pats), re.IGNORECASE)
+            for prob_type, pats in all_patterns.items()
+        }
+        
         self.operation_keywords = {
             'solve': ['solve', 'find', 'what is', 'calculate', 'determine', '='],
             'simplify': ['simplify', 'reduce', 'expand'],
@@ -87,93 +257,256 @@ class EquationClassifier:
             'limit': ['limit', 'approaches', 'tends to'],
             'plot': ['plot', 'graph', 'draw', 'sketch']
         }
+        
+        # problem_type / operation values returned by classify() are these
+        # dict keys; interning them keeps downstream dict lookups and
+        # comparisons on the identity fast path
+        self.operation_keywords = {
+            sys.intern(operation): keywords
+            for operation, keywords in self.operation_keywords.items()
+        }
+        
+        # Case-insensitive alternation of each operation's keywords
+        self.operation_res = {
+            operation: re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+            for operation, keywords in self.operation_keywords.items()
+        }
+        
+        # Aho-Corasick automaton over every operation keyword. Values carry the
+        # operation's position in operation_keywords so the earliest operation
+        # still wins, exactly as with the regex fallback.
+        self._op_automaton = None
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for priority, (operation, keywords) in enumerate(self.operation_keywords.items()):
+                for keyword in keywords:
+                    automaton.add_word(keyword, (priority, operation))
+            automaton.make_automaton()
+            self._op_automaton = automaton
+        
+        # Hyperscan database covering problem-type patterns and operation
+        # keywords, so one scan replaces both detectors when available
+        (self._hs_db, self._hs_targets,
+         self._hs_type_names, self._hs_operation_names) = self._build_hyperscan_db(all_patterns)
+        
+        # classify() is pure in input_text, so repeats within one long-lived
+        # classifier skip all pattern matching. ocr_service runs smart_math_engine
+        # in a fresh subprocess per request, where this cache always starts empty;
+        # it only pays off for in-process callers. Results are frozen and
+        # to_dict() copies, so nothing mutable leaks out of the cache.
+        self._classify_cached = lru_cache(maxsize=1024)(self._classify)
 
-    def classify(self, input_text: str) -> Dict:
+    def classify(self, input_text: str) -> ClassificationResult:
         """
         Automatically classify the type of mathematical problem
-        Returns: dict with problem_type, operation, and extracted info
+        Returns: ClassificationResult with problem_type, operation, and extracted info
         """
-        input_lower = input_text.lower()
+        if not isinstance(input_text, str):
+            input_text = '' if input_text is None else str(input_text)
         
-        # Detect problem type
-        problem_type = self._detect_problem_type(input_text, input_lower)
+        # Nothing to match in blank input; skip the scans and the cache
+        if not input_text or input_text.isspace():
+            return _EMPTY_RESULT
         
-        # Detect operation
-        operation = self._detect_operation(input_lower)
+        return self._classify_cached(input_text)
+
+    def classify_batch(self, texts: Iterable[str]) -> List[ClassificationResult]:
+        """
+        Classify many inputs in one call, e.g. every equation found by OCR.
+        Each input goes through classify(), so blank and non-str items are handled
+        the same way; duplicates hit the cache and share the same immutable result.
+        Returns: list of ClassificationResult in input order
+        """
+        return [self.classify(text) for text in texts]
+
+    def _classify(self, input_text: str) -> ClassificationResult:
+        """Uncached classification"""
+        if self._hs_db is not None:
+            # Detect problem type and operation in a single Hyperscan pass
+            problem_type, operation = self._detect_with_hyperscan(input_text)
+        else:
+            # Detect problem type
+            problem_type = self._detect_problem_type(input_text)
+            
+            # Detect operation
+            operation = self._detect_operation(input_text)
         
         # Extract variables (basic regex-based extraction)
         variables = self._extract_variables_simple(input_text)
         
+        # One pass for solve-for phrases and integration limits
+        found = self._scan_extractions(input_text)
+        
         # Detect what to solve for
-        solve_for = self._detect_solve_for(input_text, variables)
+        solve_for = self._detect_solve_for(found, variables)
         
         # Extract equation
         equation = self._extract_equation(input_text)
         
         # Detect if definite or indefinite (for integrals)
-        limits = self._extract_limits(input_text)
-        
-        return {
-            'problem_type': problem_type,
-            'operation': operation,
-            'equation': equation,
-            'variables': variables,
-            'solve_for': solve_for,
-            'limits': limits,
-            'confidence': self._calculate_confidence(problem_type, operation)
-        }
+        limits = self._extract_limits(found)
+        
+        return ClassificationResult(
+            problem_type=problem_type,
+            operation=operation,
+            equation=equation,
+            variables=tuple(variables),
+            solve_for=solve_for,
+            limits=limits,
+            confidence=self._calculate_confidence(problem_type, operation)
+        )
+
+    def _build_hyperscan_db(self, patterns: Dict[str, List[str]]) -> Tuple[Optional[Any], list, tuple, tuple]:
+        """
+        Compile every problem-type pattern and operation keyword into one
+        Hyperscan database. Returns (db, pattern id -> target, type names,
+        operation names); the names map target indices back to labels. The
+        db is None when hyperscan is unavailable or rejects a pattern,
+        leaving classify() on the regex path.
+        """
+        if hyperscan is None:
+            return None, [], (), ()
+        
+        # No HS_FLAG_UCP: Hyperscan rejects \b in UCP mode, so word boundaries
+        # and case folding are ASCII-only on this path
+        base_flags = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8
+        expressions, flags, targets = [], [], []
+        
+        for type_index, pats in enumerate(patterns.values()):
+            for p in pats:
+                expressions.append(p.encode('utf-8'))
+                flags.append(base_flags | (hyperscan.HS_FLAG_CASELESS if _case_flags(p) else 0))
+                targets.append(('type', type_index))
+        
+        for priority, keywords in enumerate(self.operation_keywords.values()):
+            for keyword in keywords:
+                expressions.append(re.escape(keyword).encode('utf-8'))
+                flags.append(base_flags | hyperscan.HS_FLAG_CASELESS)
+                targets.append(('operation', priority))
+        
+        try:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=expressions,
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=flags,
+            )
+        except hyperscan.error:
+            return None, [], (), ()
+        return db, targets, tuple(self.patterns), tuple(self.operation_keywords)
 
-    def _detect_problem_type(self, text: str, text_lower: str) -> str:
+    def _detect_with_hyperscan(self, text: str) -> Tuple[str, str]:
+        """Detect problem type and operation from one Hyperscan scan"""
+        matched = set()
+        self._hs_db.scan(text.encode('utf-8'), match_event_handler=_collect_match, context=matched)
+        
+        type_scores = [0] * len(self._hs_type_names)
+        best_priority = None
+        for pattern_id in matched:
+            kind, index = self._hs_targets[pattern_id]
+            if kind == 'type':
+                type_scores[index] += 1
+            elif best_priority is None or index < best_priority:
+                best_priority = index
+        
+        # Same tie-breaking as _detect_problem_type: earliest category wins
+        best_type, best_score = 'algebra', 0
+        for prob_type, score in zip(self._hs_type_names, type_scores):
+            if score > best_score:
+                best_type, best_score = prob_type, score
+        
+        operation = self._hs_operation_names[best_priority] if best_priority is not None else 'solve'
+        return best_type, operation
+
+    def _detect_problem_type(self, text: str) -> str:
         """Detect the category of mathematical problem"""
-        scores = {}
+        # Track the best category inline; strict '>' keeps the earliest
+        # category on ties, and 'algebra' is the default when nothing matches
+        best_type, best_score = 'algebra', 0
+        text_lower = None  # Only built if a category with literals matches
+        has_equals = '=' in text
         
         for prob_type, patterns in self.patterns.items():
+            if not self.category_res[prob_type].search(text):
+                continue
+            
             score = 0
-            for pattern in patterns:
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    score += 1
-            if score > 0:
-                scores[prob_type] = score
+            literals = self.literals[prob_type]
+            if literals:
+                if text_lower is None:
+                    text_lower = text if text.islower() else text.lower()
+                score += sum(literal in text_lower for literal in literals)
+            if patterns:
+                score += score_patterns(patterns, text)
+            if has_equals:
+                score += score_patterns(self.equation_patterns[prob_type], text)
+            if score > best_score:
+                best_type, best_score = prob_type, score
         
-        if scores:
-            return max(scores, key=scores.get)
-        return 'algebra'  # default
+        return best_type
 
-    def _detect_operation(self, text_lower: str) -> str:
+    def _detect_operation(self, text: str) -> str:
         """Detect what operation to perform"""
-        for operation, keywords in self.operation_keywords.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    return operation
+        if self._op_automaton is not None:
+            # The automaton is case-sensitive; only fold text that needs it
+            if not text.islower():
+                text = text.lower()
+            
+            # One linear pass reports every keyword occurrence
+            best = None
+            for _, match in self._op_automaton.iter(text):
+                if best is None or match < best:
+                    best = match
+            return best[1] if best else 'solve'
+        
+        for operation, keyword_re in self.operation_res.items():
+            if keyword_re.search(text):
+                return operation
         return 'solve'  # default
 
     def _extract_variables_simple(self, text: str) -> List[str]:
-        """Extract mathematical variables from text using regex"""
-        # Find single letters that might be variables (excluding common words)
-        variables = re.findall(r'\b([a-zA-Z])\b', text)
+        """Extract mathematical variables (standalone single letters) from text"""
+        # Set one bit per single letter that isn't part of a longer word;
+        # duplicates collapse for free and no match list is allocated
+        letter_bits = _LETTER_BITS
+        mask = 0
+        last = len(text) - 1
+        for i, ch in enumerate(text):
+            bit = letter_bits.get(ch)
+            if bit is None:
+                continue
+            if i > 0 and _is_word_char(text[i - 1]):
+                continue
+            if i < last and _is_word_char(text[i + 1]):
+                continue
+            mask |= bit
         
-        # Filter out common words and duplicates
-        excluded = {'a', 'i', 'A', 'I', 'e', 'E'}
-        variables = [v for v in variables if v not in excluded]
+        # Filter out common words ('a', 'I') and constants ('e')
+        mask &= ~_EXCLUDED_VARIABLES_MASK
         
-        return list(set(variables))
+        # Decode set bits lowest-first, giving a stable a-z, A-Z order
+        variables = []
+        while mask:
+            lowest = mask & -mask
+            variables.append(string.ascii_letters[lowest.bit_length() - 1])
+            mask ^= lowest
+        return variables
 
-    def _detect_solve_for(self, text: str, variables: List[str]) -> Optional[str]:
+    def _scan_extractions(self, text: str) -> Dict[str, re.Match]:
+        """Collect the first match of each solve-for phrase and limit form"""
+        found = {}
+        for match in self.EXTRACTION_RE.finditer(text):
+            found.setdefault(match.lastgroup, match)
+        return found
+
+    def _detect_solve_for(self, found: Dict[str, re.Match], variables: List[str]) -> Optional[str]:
         """Detect which variable to solve for"""
-        # Check for explicit "solve for x" pattern
-        match = re.search(r'solve for\s+([a-zA-Z])', text, re.IGNORECASE)
-        if match:
-            return match.group(1)
-        
-        # Check for "find x" pattern
-        match = re.search(r'find\s+([a-zA-Z])', text, re.IGNORECASE)
-        if match:
-            return match.group(1)
-        
-        # Check for "what is x" pattern
-        match = re.search(r'what is\s+([a-zA-Z])', text, re.IGNORECASE)
-        if match:
-            return match.group(1)
+        # Check for explicit "solve for x", "find x" and "what is x" patterns
+        for kind in self.SOLVE_FOR_KINDS:
+            match = found.get(kind)
+            if match:
+                return match.group(f'{kind}_var')
         
         # Default to 'x' if it exists, otherwise first variable
         if 'x' in variables:
@@ -186,24 +519,24 @@ class EquationClassifier:
     def _extract_equation(self, text: str) -> str:
         """Extract the mathematical equation from text"""
         # Remove common question words
-        equation = re.sub(r'(solve|find|calculate|what is|determine)\s+', '', text, flags=re.IGNORECASE)
-        equation = re.sub(r'(for|the value of)\s+[a-zA-Z]\s*', '', equation, flags=re.IGNORECASE)
+        equation = self.QUESTION_WORDS_RE.sub('', text)
+        equation = self.SOLVE_TARGET_RE.sub('', equation)
         equation = equation.strip()
         
         return equation
 
-    def _extract_limits(self, text: str) -> Optional[Tuple[float, float]]:
+    def _extract_limits(self, found: Dict[str, re.Match]) -> Optional[Tuple[float, float]]:
         """Extract integration limits or boundary conditions"""
         # Pattern for "from a to b" or "between a and b"
-        match = re.search(r'(?:from|between)\s+([-\d.]+)\s+(?:to|and)\s+([-\d.]+)', text)
+        match = found.get('range')
         if match:
-            return (float(match.group(1)), float(match.group(2)))
+            return (float(match.group('range_lo')), float(match.group('range_hi')))
         
         # Pattern for limits in bracket format [a, b]
-        match = re.search(r'\[([^,]+),\s*([^\]]+)\]', text)
+        match = found.get('bracket')
         if match:
             try:
-                return (float(match.group(1)), float(match.group(2)))
+                return (float(match.group('bracket_lo')), float(match.group('bracket_hi')))
             except ValueError:
                 pass
         
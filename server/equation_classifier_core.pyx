@@ -0,0 +1,19 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled scoring loop for EquationClassifier
+
+Optional. Build in place with:
+    cythonize -i equation_classifier_core.pyx
+equation_classifier falls back to its pure-Python score_patterns when
+this extension is not built.
+"""
+
+
+cpdef int score_patterns(tuple patterns, str text):
+    """Count how many compiled patterns match somewhere in text"""
+    cdef int score = 0
+    cdef object pattern
+    for pattern in patterns:
+        if pattern.search(text) is not None:
+            score += 1
+    return score
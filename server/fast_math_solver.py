@@ -4,21 +4,27 @@ Supports: Algebra, Calculus, Physics, Trigonometry, Statistics, Linear Algebra,
 Optimized for speed by keeping SymPy loaded in memory
 """
 
-from sympy import *
+from sympy import (
+    Abs, E, Eq, Float, Function, I, Poly, Rational, S, Symbol, oo, pi, zoo,
+    acos, acosh, asin, asinh, atan, cos, cosh, cot, csc, exp, log, sec, sin, sinh, sqrt, tan,
+    diff, dsolve, expand_trig, integrate, lambdify, latex, limit,
+    series, simplify, solve, solve_univariate_inequality, symbols, sympify, trigsimp,
+)
+from sympy.core.assumptions import check_assumptions
 from sympy.core.mul import Mul
 from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication_application
-from sympy.parsing.latex import parse_latex
-from sympy.physics.mechanics import dynamicsymbols
-from sympy.physics.vector import ReferenceFrame
-from sympy.stats import Normal, Die, Binomial, density, E as Expectation, variance, Poisson, Exponential
-from sympy.vector import CoordSys3D, divergence, curl, gradient
-from sympy.geometry import Point, Line, Circle, Triangle, Polygon
-from sympy.matrices import Matrix, eye, zeros, ones
-from typing import Dict, Any, Optional, List, Tuple
+from sympy.matrices import ImmutableMatrix, Matrix, MatrixBase
+from typing import Dict, Any, Optional, List, Tuple, Set
+from collections import Counter
+from functools import lru_cache
+import importlib.util
+import math
+import operator
 import re
+import string
+import threading
 
-# Keep SymPy initialized
-init_printing(use_latex=True)
+import numpy as np
 
 # Pre-initialize common symbols for faster solving
 x, y, z, t, n, k = symbols('x y z t n k', real=True)
@@ -31,9 +37,406 @@ m, M, v, u, F, g_sym, T, P, V, R = symbols('m M v u F g T P V R', positive=True)
 lambda_var, mu_var = symbols('lambda_var mu_var', positive=True)
 N_force = symbols('N', positive=True)  # Normal force
 c_heat = symbols('c', positive=True)   # Specific heat capacity
+V_volt = symbols('V_voltage')          # Voltage in Ohm's law
+
 pi_sym = pi
 e_sym = E
 
+# Unicode operators with the same spelling in LaTeX and SymPy input
+_UNICODE_OPERATORS = {
+    '∫': r'\int',      # Integral symbol
+    '∂': r'\partial',  # Partial derivative
+    '∑': r'\sum',      # Summation
+    '∏': r'\prod',     # Product
+    '≠': '!=',         # Not equal
+    '≤': '<=',         # Less than or equal
+    '≥': '>=',         # Greater than or equal
+    '±': '+-',         # Plus-minus
+    '×': '*',          # Multiplication
+    '÷': '/',          # Division
+    '≈': '=',          # Approximately equal (treat as equal)
+}
+
+# Unicode math symbols -> LaTeX, applied by _convert_unicode_to_latex before pattern matching
+_UNICODE_TO_LATEX = {
+    **_UNICODE_OPERATORS,
+    '√': r'\sqrt',     # Square root
+    '∞': r'\infty',    # Infinity
+    '²': '^{2}',       # Superscript 2
+    '³': '^{3}',       # Superscript 3
+    '⁴': '^{4}',       # Superscript 4
+    '⁵': '^{5}',       # Superscript 5
+    '⁶': '^{6}',       # Superscript 6
+    '⁷': '^{7}',       # Superscript 7
+    '⁸': '^{8}',       # Superscript 8
+    '⁹': '^{9}',       # Superscript 9
+    '⁰': '^{0}',       # Superscript 0
+}
+
+# Unicode math symbols -> SymPy-friendly text, applied by _clean_latex
+_UNICODE_TO_SYMPY = {
+    **_UNICODE_OPERATORS,
+    '√': 'sqrt',       # Square root (convert to function)
+    '∞': 'oo',         # Infinity (SymPy)
+    'π': 'pi',         # Pi
+    'θ': 'theta',      # Theta
+    'φ': 'phi',        # Phi
+    'α': 'alpha',      # Alpha
+    'β': 'beta',       # Beta
+    'γ': 'gamma',      # Gamma
+    'δ': 'delta',      # Delta
+    'ε': 'epsilon',    # Epsilon
+    'ζ': 'zeta',       # Zeta
+    'η': 'eta',        # Eta
+    'ι': 'iota',       # Iota
+    'κ': 'kappa',      # Kappa
+    'λ': 'lambda_var', # Lambda (renamed to avoid keyword)
+    'μ': 'mu_var',     # Mu (renamed to avoid keyword)
+    'ν': 'nu',         # Nu
+    'ξ': 'xi',         # Xi
+    'ο': 'omicron',    # Omicron
+    'ρ': 'rho',        # Rho
+    'σ': 'sigma',      # Sigma
+    'τ': 'tau',        # Tau
+    'υ': 'upsilon',    # Upsilon
+    'χ': 'chi',        # Chi
+    'ψ': 'psi',        # Psi
+    'ω': 'omega',      # Omega
+    # Uppercase Greek
+    'Γ': 'Gamma',
+    'Δ': 'Delta',
+    'Θ': 'Theta',
+    'Λ': 'Lambda',
+    'Ξ': 'Xi',
+    'Π': 'Pi',
+    'Σ': 'Sigma',
+    'Φ': 'Phi',
+    'Ψ': 'Psi',
+    'Ω': 'Omega',
+}
+_LATEX_FUNCTIONS = {
+    # LaTeX trig functions: \sin -> sin, \cos -> cos, etc.
+    **{f'\\{func}': func for func in ('sin', 'cos', 'tan', 'sec', 'csc', 'cot', 'arcsin', 'arccos', 'arctan')},
+    r'\ln': 'log',     # Natural log in SymPy
+    r'\\ln': 'log',    # Escaped \\ln also ends up as log
+    r'\log': 'log',
+    r'\exp': 'exp',
+    r'\cdot': '*',
+    r'\times': '*',
+    r'\left': '',
+    r'\right': '',
+}
+
+
+def _alternation(keys) -> re.Pattern:
+    """Literal alternation, longest keys first so prefixes never shadow them"""
+    return re.compile('|'.join(map(re.escape, sorted(keys, key=len, reverse=True))))
+
+
+# _clean_latex's single-pass table: \infty maps straight to oo, as ∞ does
+_UNICODE_SYMBOL_REPLACEMENTS = {**_UNICODE_TO_SYMPY, r'\infty': 'oo'}
+_RE_UNICODE_SYMBOLS = _alternation(_UNICODE_SYMBOL_REPLACEMENTS)
+_RE_UNICODE_LATEX = _alternation(_UNICODE_TO_LATEX)
+_RE_LATEX_FUNCTIONS = _alternation(_LATEX_FUNCTIONS)
+
+
+def _replace_unicode_symbol(match) -> str:
+    return _UNICODE_SYMBOL_REPLACEMENTS[match.group()]
+
+
+def _replace_unicode_latex(match) -> str:
+    return _UNICODE_TO_LATEX[match.group()]
+
+
+def _replace_latex_function(match) -> str:
+    return _LATEX_FUNCTIONS[match.group()]
+
+
+# _clean_latex rewrite rules, in the order they are applied
+_RE_ABS_BARS = re.compile(r'\|([^|]+)\|')
+_RE_LAMBDA_WORD = re.compile(r'\blambda\b')
+_RE_MU_WORD = re.compile(r'\bmu\b')
+_RE_BRACED_SUBSCRIPT = re.compile(r'([a-zA-Z_]+)_{([^}]+)}')
+_RE_BRACED_EXPONENT = re.compile(r'\^{([^}]+)}')
+_RE_FRAC = re.compile(r'\\frac\{([^}]+)\}\{([^}]+)\}')
+_RE_SQRT_BRACES = re.compile(r'\\sqrt\{([^}]+)\}')
+_RE_DIGIT_LETTER = re.compile(r'(\d)([a-zA-Z])')
+_RE_ADJACENT_PARENS = re.compile(r'\)\s*\(')
+_RE_TRIG_POWER_PAREN = re.compile(r'(sin|cos|tan|sec|csc|cot)\*\*\((\d+)\)\(')
+_RE_TRIG_POWER = re.compile(r'(sin|cos|tan|sec|csc|cot)\*\*(\d+)\(')
+
+# Validation patterns, compiled once instead of on every _validate_equation call
+_RE_DIFFERENTIAL = re.compile(r'd[a-z]')
+_RE_INT_LIMITS = re.compile(r'(?:\\int|∫)_\{[^}]+\}\^\{[^}]+\}')
+_RE_DDX_VAR = re.compile(r'd/d([a-z])')
+_RE_FRAC_DDX = re.compile(r'\\frac\{d\}\{d[a-z]\}')
+_RE_LIM_TEX_POINT = re.compile(r'\\lim_\{[a-z]\s*\\to\s*[^}]+\}')
+_RE_LIM_ARROW_POINT = re.compile(r'lim\s+[a-z]\s*→\s*\S+')
+_RE_MISSING_OPERAND = re.compile(r'[+\-*/^]\s*[=]|[=]\s*[+*/^]')
+_RE_BEGIN_ENV = re.compile(r'\\begin\{([^}]+)\}')
+_RE_END_ENV = re.compile(r'\\end\{([^}]+)\}')
+_RE_CONSECUTIVE_OPS = re.compile(r'[+\-*/^]{2,}')
+_RE_LATEX_COMMAND = re.compile(r'\\[a-zA-Z]+')
+# _validate_equation sections in the order they run: (operation, markers, lowercase word markers).
+# A section runs when it is the requested operation or its markers appear in the input.
+_VALIDATION_TRIGGERS = (
+    ('integral', (r'\int', '∫'), ('integrate',)),
+    ('derivative', ('d/d', r'\frac{d'), ('derivative',)),
+    ('limit', (r'\lim',), ('lim',)),  # 'lim' also covers 'limit'
+    ('equation', (), ()),
+    ('matrix', (r'\begin{',), ('matrix',)),
+)
+# Standard characters + Unicode math symbols + superscripts/subscripts
+_ALLOWED_SYMBOLS = '+-*/^(){}[]_.,=<>!|√∫∞×÷≠≤≥πθαβγδεζηικλμνξοπρστυφχψωΓΔΘΛΞΠΣΥΦΨΩ⁰¹²³⁴⁵⁶⁷⁸⁹ⁿ₀₁₂₃₄₅₆₇₈₉→'
+_ALLOWED_CHARS = frozenset(string.ascii_letters + string.digits + _ALLOWED_SYMBOLS)
+_RE_ALLOWED_CHARS = re.compile(r'[a-zA-Z0-9\s' + re.escape(_ALLOWED_SYMBOLS) + ']')
+_ALLOWED_ASCII_BYTES = bytes(i for i in range(128) if _RE_ALLOWED_CHARS.match(chr(i)))
+
+# parse_expr transformations used by _parse
+_TRANSFORMATIONS = standard_transformations + (implicit_multiplication_application,)
+
+# Subscripted names (x_1, y_i, theta_1) that _parse turns into real symbols
+_RE_SUBSCRIPTED_VAR = re.compile(r'([a-zA-Z_]+)_([a-zA-Z0-9]+)')
+
+# Division by a literal zero (/0, / 0, /0.0, /00) but not /0.5 or /02
+_RE_DIV_ZERO = re.compile(r'/\s*0+(?:\.0*)?(?![\d.])')
+
+# solve_calculus notations, tried in order. Named groups keep the handlers
+# independent of where each notation puts the variable, point and expression.
+# Raw input (before _clean_latex destroys \lim and \frac{d}{dx}):
+_LIMIT_PATTERNS = tuple(re.compile(pattern, re.DOTALL) for pattern in (
+    r'\\lim_\{(?P<var>[a-z])\s*\\to\s*(?P<point>[^}]+)\}\s*(?P<expr>.+)',               # \lim_{x\to 0} expr
+    r'lim\s+(?P<var>[a-z])\s*→\s*(?P<point>\S+)\s+(?P<expr>.+)',                         # lim x→0 expr
+    r'limit\s*\(\s*(?P<expr>.+?)\s*,\s*(?P<var>[a-z])\s*,\s*(?P<point>.+?)\s*\)',         # limit(expr, x, 0)
+))
+_DERIVATIVE_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'd/d(?P<var>[a-zA-Z])\s*\((?P<expr>.+)\)',                  # d/dx(expr)
+    r'd/d(?P<var>[a-zA-Z])\s+(?P<expr>.+)',                      # d/dx expr
+    r'\\frac\{d\}\{d(?P<var>[a-zA-Z])\}\s*\((?P<expr>.+)\)',      # \frac{d}{dx}(expr)
+    r'\\frac\{d\}\{d(?P<var>[a-zA-Z])\}\s+(?P<expr>.+)',          # \frac{d}{dx} expr
+))
+_RE_DEFINITE_INTEGRAL = re.compile(r'\\int_\{([^}]+)\}\^\{([^}]+)\}\s*(.+?)\s+d([a-z])')
+_RE_INDEFINITE_INTEGRAL = re.compile(r'\\int\s*(.+?)\s*d([a-z])')
+
+# After _clean_latex, for notations only recognisable once cleaned:
+_CLEAN_DERIVATIVE_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'd/d(?P<var>[a-z])\s*\((?P<expr>.+)\)',
+    r'\\frac\{d\}\{d(?P<var>[a-z])\}\s*\((?P<expr>.+)\)',
+    r'\\frac\{d\}\{d(?P<var>[a-z])\}\s*(?P<expr>.+)',
+))
+_CLEAN_LIMIT_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE | re.DOTALL) for pattern in (
+    r'\\lim_\{(?P<var>[a-z])\s*\\to\s*(?P<point>[^}]+)\}\s*(?P<expr>.+)',               # \lim_{x\to a} f(x)
+    r'lim\s+(?P<var>[a-z])\s*→\s*(?P<point>\S+)\s+(?P<expr>.+)',                         # lim x→a f(x)
+    r'lim_?\{?(?P<var>[a-z])\s*->\s*(?P<point>[^}]+)\}?\s*(?P<expr>.+)',                  # lim_{x->a} f(x)
+    r'limit\s+(?:as\s+)?(?P<var>[a-z])\s+(?:approaches|to)\s+(?P<point>\S+)\s+(?:of\s+)?(?P<expr>.+)',
+))
+
+
+def _first_match(patterns, text: str):
+    """Return the match of the first pattern that matches text, else None"""
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return match
+    return None
+
+
+# sin**(2), sin^2 and sin^{2} -> sin(x)**2 in solve_trigonometry
+_RE_TRIG_POWER_PREFIX = re.compile(r'(sin|cos|tan|sec|csc|cot)(?:\*\*\((\d+)\)|\^(\d+)|\^\{(\d+)\})')
+
+
+def _expand_trig_power(match) -> str:
+    return f"{match.group(1)}(x)**{match.group(2) or match.group(3) or match.group(4)}"
+
+
+# Calculus operation markers, case-sensitive except for the English words.
+# 'lim' also covers \lim and limit. \int only consumes '\in' so that a
+# 'taylor' written right after it is still seen.
+_RE_CALCULUS_OP = re.compile(
+    r'(?P<integral>\\in(?=t)|∫|(?i:integrate))'
+    r'|(?P<derivative>d/d|\\frac\{d|(?i:derivative))'
+    r'|(?P<limit>(?i:lim))'
+    r'|(?P<arrow>→)'
+    r'|(?P<series>(?i:taylor|series))'
+)
+
+
+def _calculus_markers(equation: str) -> Set[str]:
+    """Kinds of calculus markers in equation, found in one scan"""
+    return {match.lastgroup for match in _RE_CALCULUS_OP.finditer(equation)}
+
+
+def _calculus_operation(equation: str) -> str:
+    """'integral', 'derivative', 'limit' or 'general', in that order of precedence"""
+    markers = _calculus_markers(equation)
+    for operation in ('integral', 'derivative', 'limit'):
+        if operation in markers:
+            return operation
+    return 'general'
+
+
+# Kinematics variables (v, u, a, t, s) as standalone identifiers
+_RE_KINEMATICS_VAR = re.compile(r'\b[vuats]\b')
+
+# Inequality operators; two-character forms first so '<=' is not read as '<'
+_RE_INEQUALITY = re.compile(r'<=|>=|<|>')
+_INEQUALITY_OPS = {'<=': operator.le, '>=': operator.ge, '<': operator.lt, '>': operator.gt}
+
+
+@lru_cache(maxsize=256)
+def _sym(name: str, real: bool = False) -> Symbol:
+    """Cached Symbol factory; real=True adds the real assumption"""
+    return symbols(name, real=True) if real else symbols(name)
+
+
+# Factors that make a product a candidate for integration by parts: the
+# functions whose names contain sin, cos, exp or log
+_IBP_FUNCTIONS = (sin, cos, exp, log, asin, acos, sinh, cosh, asinh, acosh)
+
+
+# Limit points and integration bounds that need no parsing
+_COMMON_POINTS = {'0': S.Zero, '1': S.One, '-1': S.NegativeOne, 'oo': oo, '-oo': -oo, 'pi': pi}
+
+
+def _first_symbol(expr, default=x):
+    """
+    First free symbol of expr, or default. Lowercase names win over uppercase
+    ones, which in formulas like F = m*a are usually the given quantity, then
+    alphabetical order keeps the choice stable across runs.
+    """
+    free = expr.free_symbols
+    return min(free, key=lambda sym: (sym.name[0].isupper(), sym.name)) if free else default
+
+
+# trigsimp/expand_trig are costly rewrites; different inputs often parse to the
+# same expression, so results are shared per (immutable) expression
+_trigsimp_cached = lru_cache(maxsize=512)(trigsimp)
+_expand_trig_cached = lru_cache(maxsize=512)(expand_trig)
+
+
+@lru_cache(maxsize=None)
+def _ideal_gas_solutions():
+    """PV = nRT solved for its first symbol (n); constant, so solved once"""
+    return solve(Eq(P*V, n*R*T), _first_symbol(P*V - n*R*T, P))
+
+
+@lru_cache(maxsize=256)
+def _ibp_split(integrand, var) -> Optional[Tuple]:
+    """
+    (u, dv) for integrating a product by parts, or None.
+    The first factor in var that is a polynomial becomes u (or, if it is
+    trig/exp/log, dv) and the remaining factors the other part. Failing
+    that, a product with trig/exp/log splits into its polynomial and
+    non-polynomial factors. The factors are walked once.
+    """
+    if not integrand.is_Mul:
+        return None
+    poly_parts = []
+    func_parts = []
+    for arg in integrand.args:
+        has_var = arg.has(var)
+        is_poly = not has_var or arg.is_polynomial(var)
+        if has_var and (is_poly or arg.has(*_IBP_FUNCTIONS)):
+            rest = Mul(*[factor for factor in integrand.args if factor is not arg])
+            u_part, dv_part = (arg, rest) if is_poly else (rest, arg)
+            break
+        (poly_parts if is_poly else func_parts).append(arg)
+    else:
+        if not (poly_parts and func_parts and integrand.has(*_IBP_FUNCTIONS)):
+            return None
+        u_part, dv_part = Mul(*poly_parts), Mul(*func_parts)
+    return (u_part, dv_part) if u_part and dv_part else None
+
+
+def _linear_solutions(expr, var) -> Optional[List]:
+    """Closed-form root of expr = 0 when expr is linear in var, else None (use solve).
+
+    Floats are left to solve, which rationalises them first. Like solve, a
+    root that contradicts the assumptions on var (e.g. positive) is dropped.
+    """
+    if expr.has(Float) or not expr.is_polynomial(var):
+        return None
+    poly = Poly(expr, var)
+    if poly.degree() != 1:
+        return None
+    slope, intercept = poly.all_coeffs()
+    if slope.could_extract_minus_sign():
+        # Keep the sign on the numerator: (v - u)/t rather than -(u - v)/t
+        slope, intercept = -slope, -intercept
+    root = (-intercept) / slope
+    return [] if check_assumptions(root, **var.assumptions0) is False else [root]
+
+
+@lru_cache(maxsize=256)
+def _fast_callable(expr, variables: Tuple):
+    """
+    Numeric evaluator for expr, shared by structurally equal expressions.
+    Common subexpressions are hoisted into locals (cse=True) so they are
+    computed once per call. JIT-compiled with numba (on first call) when
+    available, else NumPy-backed.
+    """
+    try:
+        import numba  # Optional; imported here so solver startup never pays for it
+        return numba.njit(lambdify(variables, expr, modules='math', cse=True))
+    except Exception:
+        pass
+    return lambdify(variables, expr, modules='numpy', cse=True)
+
+# Data values in statistics problems ("mean of 1, 2.5, -3")
+_RE_STAT_NUMBER = re.compile(r'-?\d+\.?\d*')
+# Distribution parameters and nPr/nCr, searched by solve_statistics
+_RE_BINOM_N = re.compile(r'n\s*=\s*(\d+)')
+_RE_BINOM_P = re.compile(r'p\s*=\s*(0?\.\d+|\d+\.?\d*)')
+_RE_BINOM_K = re.compile(r'[xX]\s*=\s*(\d+)')
+_RE_MU = re.compile(r'μ\s*=\s*(-?\d+\.?\d*)|mu\s*=\s*(-?\d+\.?\d*)')
+_RE_SIGMA = re.compile(r'σ\s*=\s*(\d+\.?\d*)|sigma\s*=\s*(\d+\.?\d*)')
+_RE_PERM = re.compile(r'(\d+)\s*P\s*(\d+)')
+_RE_COMB = re.compile(r'(\d+)\s*C\s*(\d+)')
+# Nested-list matrices "[[1,2],[3,4]]" in linear algebra problems
+_RE_MATRIX = re.compile(r'\[\[(.*?)\]\]')
+# "transpose", or a matrix raised to T: [[1,2],[3,4]]^T, ]^{T} (matched on the lowercased text)
+_RE_TRANSPOSE = re.compile(r'transpose|\]\s*\^\s*(?:t|\{\s*t\s*\})(?![a-z])')
+# Matrix cells int() reads exactly as _parse would (no leading zeros, '+', or '_')
+_RE_INT_CELL = re.compile(r'\s*-?(?:0|[1-9]\d*)\s*')
+
+
+def _stat_numbers(text: str) -> np.ndarray:
+    """All numbers in text as a float64 array (numpy parses the strings in C)"""
+    return np.array(_RE_STAT_NUMBER.findall(text), dtype=np.float64)
+
+# One request lowercases the same equation in fast_solve, _detect_type, validation and the
+# solver; str caches its hash, so repeat lookups for that string are O(1)
+_lowercase = lru_cache(maxsize=256)(str.lower)
+
+
+def _copy_result(value):
+    """
+    Copy the mutable parts of a cached result: dicts, lists, tuples (which can
+    hold lists, e.g. eigenvects()) and mutable matrices. Immutable leaves (str,
+    numbers, SymPy expressions) are shared.
+    """
+    if isinstance(value, dict):
+        return {key: _copy_result(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_result(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_copy_result(item) for item in value)
+    if isinstance(value, MatrixBase) and not isinstance(value, ImmutableMatrix):
+        return value.copy()
+    return value
+
+
+def _rational_domain_matrix(mat: Matrix):
+    """mat as a DomainMatrix over ZZ/QQ when every entry is an exact number, else None
+
+    DomainMatrix runs det/rank with flint or plain Python ints instead of the generic
+    expression engine, and stays exact (LAPACK floats would print 0 as 4.4e-16).
+    """
+    if all(entry.is_Rational for entry in mat):
+        return mat.to_DM()
+    return None
+
+
 class FastMathSolver:
     """
     Comprehensive solver supporting all math types
@@ -47,11 +450,52 @@ class FastMathSolver:
     
     def __init__(self):
         """Initialize with pre-warmed SymPy operations"""
+        # SymPy expressions are immutable, so parsed results can be shared
+        self._parse_cached = lru_cache(maxsize=4096)(self._parse_uncached)
+        # Namespace for parse_expr, built once; _parse copies it only to add subscripted names.
+        # Don't include variable names that will be used for integration/differentiation
+        self._base_local_dict = {
+            # Pre-defined symbols (use these when they appear)
+            'theta': theta, 'phi': phi, 'alpha': alpha, 'beta': beta, 'gamma': gamma,
+            # Physics symbols
+            'm': m, 'M': M, 'v': v, 'u': u, 'F': F, 'g': g_sym, 'T': T, 'P': P, 'V': V, 'R': R,
+            'lambda_var': lambda_var, 'mu_var': mu_var, 'N': N_force,
+            'Q': symbols('Q'), 'W': symbols('W'), 's': symbols('s'),
+            'E': symbols('E_energy'), 'c': c_heat, 'nu': symbols('nu'),
+            # Math constants
+            'pi': pi, 'e': E,
+            # Functions
+            'sin': sin, 'cos': cos, 'tan': tan, 'sec': sec, 'csc': csc, 'cot': cot,
+            'arcsin': asin, 'arccos': acos, 'arctan': atan,
+            'sqrt': sqrt, 'log': log, 'exp': exp,
+            'oo': oo  # Infinity
+        }
+        self._clean_latex_cached = lru_cache(maxsize=4096)(self._clean_latex_uncached)
+        # Re-submitted queries skip the SymPy pipeline; callers get a fresh copy
+        self._solve_equation_cached = lru_cache(maxsize=1024)(self._solve_equation_uncached)
+        self._solve_calculus_cached = lru_cache(maxsize=1024)(self._solve_calculus_uncached)
+        self._solve_physics_cached = lru_cache(maxsize=1024)(self._solve_physics_uncached)
+        self._solve_trigonometry_cached = lru_cache(maxsize=1024)(self._solve_trigonometry_uncached)
+        self._solve_statistics_cached = lru_cache(maxsize=1024)(self._solve_statistics_uncached)
+        self._solve_linear_algebra_cached = lru_cache(maxsize=1024)(self._solve_linear_algebra_uncached)
+        
         # Pre-warm common operations to avoid first-call delay
         _ = diff(x**2, x)
         _ = integrate(x, x)
         _ = limit(sin(x)/x, x, 0)
         _ = Matrix([[1, 2], [3, 4]])
+        _ = solve(x**2 - 1, x)
+        _ = dsolve(Function('y')(x).diff(x) - x, Function('y')(x))
+        _ = series(sin(x), x, 0, 4)
+        _ = solve_univariate_inequality(x > 0, x, relational=False)
+        _ = latex(x + 1)
+        _ = self._parse('2*x + 1')
+        if importlib.util.find_spec('antlr4') is not None:  # parse_latex backend
+            try:
+                from sympy.parsing.latex import parse_latex
+                _ = parse_latex(r'\frac{1}{2}')
+            except Exception:
+                pass
     
     def _validate_equation(self, equation: str, operation_type: str = 'general') -> Dict[str, Any]:
         """
@@ -64,146 +508,171 @@ class FastMathSolver:
         Returns:
             Dict with 'valid': bool and 'error': str if invalid
         """
-        equation_lower = equation.lower()
-        original = equation
+        equation_lower = _lowercase(equation)
+        # One pass over the input for bracket balance and the character whitelist
+        char_counts = Counter(equation)
         
-        # INTEGRAL VALIDATION
-        if operation_type == 'integral' or r'\int' in equation or '∫' in equation or 'integrate' in equation_lower:
-            # Check for missing differential (dx, dy, dt, etc.)
-            has_differential = bool(re.search(r'd[a-z]', equation))
-            if not has_differential:
-                # Try to detect what variable they might want
-                cleaned = self._clean_latex(equation)
-                try:
-                    parsed = self._parse(cleaned.replace('\\int', '').replace('∫', '').strip())
-                    vars_found = list(parsed.free_symbols)
-                    if vars_found:
-                        var_name = str(vars_found[0])
-                        return {
-                            'valid': False,
-                            'error': f'Missing differential in integral',
-                            'error_type': 'missing_dx',
-                            'suggestion': f'Did you mean to include "d{var_name}"?',
-                            'hint': f'Example: ∫{cleaned} d{var_name}',
-                            'user_message': f'⚠️ Your integral is missing a differential! Try adding "d{var_name}" at the end.'
-                        }
-                except:
-                    pass
-                
-                return {
-                    'valid': False,
-                    'error': 'Missing differential in integral',
-                    'error_type': 'missing_dx',
-                    'suggestion': 'Add dx, dy, dt, or another differential at the end',
-                    'hint': 'Example: ∫x² dx  (note the "dx" at the end)',
-                    'user_message': '⚠️ Your integral is missing a differential! Please add "dx" (or dy, dt, etc.) at the end.'
-                }
-            
-            # Check for definite integral missing limits
-            if r'\int_' in equation or '∫_' in equation:
-                # Has lower limit, check for upper limit
-                if not re.search(r'\\int_\{[^}]+\}\^\{[^}]+\}', equation) and not re.search(r'∫_\{[^}]+\}\^\{[^}]+\}', equation):
-                    return {
-                        'valid': False,
-                        'error': 'Incomplete definite integral',
-                        'error_type': 'missing_limit_point',
-                        'suggestion': 'Definite integrals need both lower and upper limits',
-                        'hint': 'Example: ∫₀² x dx  or  \\int_{0}^{2} x dx',
-                        'user_message': '⚠️ Your definite integral is missing limits! Include both lower and upper bounds like ∫₀² or ∫_{0}^{2}.'
-                    }
+        # Operation-specific checks run when requested or when the input carries their markers
+        for operation, markers, word_markers in _VALIDATION_TRIGGERS:
+            if (operation == operation_type
+                    or any(marker in equation for marker in markers)
+                    or any(word in equation_lower for word in word_markers)):
+                error = self._VALIDATORS[operation](self, equation, char_counts)
+                if error:
+                    return error
         
-        # DERIVATIVE VALIDATION
-        if operation_type == 'derivative' or 'd/d' in equation or r'\frac{d' in equation or 'derivative' in equation_lower:
-            # Check for d/dx format - must have variable specified
-            if 'd/d' in equation:
-                match = re.search(r'd/d([a-z])', equation)
-                if not match:
+        return self._validate_general(equation, char_counts) or {'valid': True}
+    
+    def _validate_integral(self, equation: str, char_counts: Counter) -> Optional[Dict[str, Any]]:
+        """Missing differential or incomplete definite-integral limits"""
+        # Check for missing differential (dx, dy, dt, etc.)
+        has_differential = bool(_RE_DIFFERENTIAL.search(equation))
+        if not has_differential:
+            # Try to detect what variable they might want
+            cleaned = self._clean_latex(equation)
+            try:
+                parsed = self._parse(cleaned.replace('\\int', '').replace('∫', '').strip())
+                first_var = _first_symbol(parsed, None)
+                if first_var is not None:
+                    var_name = str(first_var)
                     return {
                         'valid': False,
-                        'error': 'Missing variable in derivative notation',
-                        'error_type': 'missing_variable',
-                        'suggestion': 'Specify which variable to differentiate with respect to',
-                        'hint': 'Example: d/dx(x²) or d/dt(sin(t))',
-                        'user_message': '⚠️ Your derivative notation is incomplete! Specify the variable like "d/dx" or "d/dt".'
+                        'error': f'Missing differential in integral',
+                        'error_type': 'missing_dx',
+                        'suggestion': f'Did you mean to include "d{var_name}"?',
+                        'hint': f'Example: ∫{cleaned} d{var_name}',
+                        'user_message': f'⚠️ Your integral is missing a differential! Try adding "d{var_name}" at the end.'
                     }
+            except:
+                pass
             
-            # Check for \frac{d}{dx} format
-            if r'\frac{d' in equation:
-                if not re.search(r'\\frac\{d\}\{d[a-z]\}', equation):
-                    return {
-                        'valid': False,
-                        'error': 'Incomplete derivative notation',
-                        'error_type': 'missing_variable',
-                        'suggestion': 'Use proper derivative notation: \\frac{d}{dx}',
-                        'hint': 'Example: \\frac{d}{dx}(x²)',
-                        'user_message': '⚠️ Your derivative notation is incomplete! Use \\frac{d}{dx} or \\frac{d}{dt}.'
-                    }
+            return {
+                'valid': False,
+                'error': 'Missing differential in integral',
+                'error_type': 'missing_dx',
+                'suggestion': 'Add dx, dy, dt, or another differential at the end',
+                'hint': 'Example: ∫x² dx  (note the "dx" at the end)',
+                'user_message': '⚠️ Your integral is missing a differential! Please add "dx" (or dy, dt, etc.) at the end.'
+            }
         
-        # LIMIT VALIDATION
-        if operation_type == 'limit' or r'\lim' in equation or 'lim' in equation_lower or 'limit' in equation_lower:
-            # Check for limit point
-            has_limit_point = bool(re.search(r'\\lim_\{[a-z]\s*\\to\s*[^}]+\}', equation) or 
-                                  re.search(r'lim\s+[a-z]\s*→\s*\S+', equation) or
-                                  'limit(' in equation_lower)
-            
-            if not has_limit_point:
+        # Check for definite integral missing limits
+        if r'\int_' in equation or '∫_' in equation:
+            # Has lower limit, check for upper limit
+            if not _RE_INT_LIMITS.search(equation):
                 return {
                     'valid': False,
-                    'error': 'Missing limit point',
+                    'error': 'Incomplete definite integral',
                     'error_type': 'missing_limit_point',
-                    'suggestion': 'Specify what value the variable approaches',
-                    'hint': 'Example: \\lim_{x\\to 0} or lim x→0',
-                    'user_message': '⚠️ Your limit is missing a point! Specify where the variable approaches, like "x→0" or "x→∞".'
+                    'suggestion': 'Definite integrals need both lower and upper limits',
+                    'hint': 'Example: ∫₀² x dx  or  \\int_{0}^{2} x dx',
+                    'user_message': '⚠️ Your definite integral is missing limits! Include both lower and upper bounds like ∫₀² or ∫_{0}^{2}.'
                 }
         
-        # EQUATION VALIDATION
-        if operation_type == 'equation':
-            # Check for balanced parentheses
-            if equation.count('(') != equation.count(')'):
+        return None
+    
+    def _validate_derivative(self, equation: str, char_counts: Counter) -> Optional[Dict[str, Any]]:
+        """Derivative notation without a variable"""
+        # Check for d/dx format - must have variable specified
+        if 'd/d' in equation:
+            match = _RE_DDX_VAR.search(equation)
+            if not match:
                 return {
                     'valid': False,
-                    'error': 'Unbalanced parentheses',
-                    'error_type': 'unbalanced_parentheses',
-                    'suggestion': 'Make sure all opening parentheses "(" have matching closing ")"',
-                    'user_message': f'⚠️ Unbalanced parentheses! You have {equation.count("(")} opening but {equation.count(")")} closing.'
+                    'error': 'Missing variable in derivative notation',
+                    'error_type': 'missing_variable',
+                    'suggestion': 'Specify which variable to differentiate with respect to',
+                    'hint': 'Example: d/dx(x²) or d/dt(sin(t))',
+                    'user_message': '⚠️ Your derivative notation is incomplete! Specify the variable like "d/dx" or "d/dt".'
                 }
-            
-            if equation.count('{') != equation.count('}'):
+        
+        # Check for \frac{d}{dx} format
+        if r'\frac{d' in equation:
+            if not _RE_FRAC_DDX.search(equation):
                 return {
                     'valid': False,
-                    'error': 'Unbalanced braces',
-                    'error_type': 'unbalanced_braces',
-                    'suggestion': 'Make sure all opening braces "{" have matching closing "}"',
-                    'user_message': f'⚠️ Unbalanced braces! You have {equation.count("{")} opening but {equation.count("}")} closing.'
+                    'error': 'Incomplete derivative notation',
+                    'error_type': 'missing_variable',
+                    'suggestion': 'Use proper derivative notation: \\frac{d}{dx}',
+                    'hint': 'Example: \\frac{d}{dx}(x²)',
+                    'user_message': '⚠️ Your derivative notation is incomplete! Use \\frac{d}{dx} or \\frac{d}{dt}.'
                 }
-            
-            # Check for operators without operands
-            if re.search(r'[+\-*/^]\s*[=]', equation) or re.search(r'[=]\s*[+*/^]', equation):
+        
+        return None
+    
+    def _validate_limit(self, equation: str, char_counts: Counter) -> Optional[Dict[str, Any]]:
+        """Limit without an approach point"""
+        # Check for limit point
+        has_limit_point = bool(_RE_LIM_TEX_POINT.search(equation) or 
+                              _RE_LIM_ARROW_POINT.search(equation) or
+                              'limit(' in _lowercase(equation))
+        
+        if not has_limit_point:
+            return {
+                'valid': False,
+                'error': 'Missing limit point',
+                'error_type': 'missing_limit_point',
+                'suggestion': 'Specify what value the variable approaches',
+                'hint': 'Example: \\lim_{x\\to 0} or lim x→0',
+                'user_message': '⚠️ Your limit is missing a point! Specify where the variable approaches, like "x→0" or "x→∞".'
+            }
+        
+        return None
+    
+    def _validate_equation_syntax(self, equation: str, char_counts: Counter) -> Optional[Dict[str, Any]]:
+        """Unbalanced brackets or operators missing an operand"""
+        # Check for balanced parentheses
+        open_parens, close_parens = char_counts['('], char_counts[')']
+        if open_parens != close_parens:
+            return {
+                'valid': False,
+                'error': 'Unbalanced parentheses',
+                'error_type': 'unbalanced_parentheses',
+                'suggestion': 'Make sure all opening parentheses "(" have matching closing ")"',
+                'user_message': f'⚠️ Unbalanced parentheses! You have {open_parens} opening but {close_parens} closing.'
+            }
+        
+        open_braces, close_braces = char_counts['{'], char_counts['}']
+        if open_braces != close_braces:
+            return {
+                'valid': False,
+                'error': 'Unbalanced braces',
+                'error_type': 'unbalanced_braces',
+                'suggestion': 'Make sure all opening braces "{" have matching closing "}"',
+                'user_message': f'⚠️ Unbalanced braces! You have {open_braces} opening but {close_braces} closing.'
+            }
+        
+        # Check for operators without operands
+        if _RE_MISSING_OPERAND.search(equation):
+            return {
+                'valid': False,
+                'error': 'Missing operand',
+                'error_type': 'missing_operand',
+                'suggestion': 'Check that all operators (+, -, *, /, ^) have numbers or variables on both sides',
+                'user_message': '⚠️ Missing operand! Make sure operators like +, -, *, / have values on both sides.'
+            }
+        
+        return None
+    
+    def _validate_matrix(self, equation: str, char_counts: Counter) -> Optional[Dict[str, Any]]:
+        """Unmatched \\begin/\\end environments"""
+        if r'\begin{' in equation:
+            # Check for matching \end{}
+            begin_matches = _RE_BEGIN_ENV.findall(equation)
+            end_matches = _RE_END_ENV.findall(equation)
+            
+            if len(begin_matches) != len(end_matches):
                 return {
                     'valid': False,
-                    'error': 'Missing operand',
-                    'error_type': 'missing_operand',
-                    'suggestion': 'Check that all operators (+, -, *, /, ^) have numbers or variables on both sides',
-                    'user_message': '⚠️ Missing operand! Make sure operators like +, -, *, / have values on both sides.'
+                    'error': 'Unmatched matrix environment',
+                    'error_type': 'unmatched_environment',
+                    'suggestion': 'Every \\begin{matrix} needs a matching \\end{matrix}',
+                    'user_message': '⚠️ Unmatched matrix environment! Make sure every \\begin{matrix} has an \\end{matrix}.'
                 }
         
-        # MATRIX VALIDATION
-        if operation_type == 'matrix' or 'matrix' in equation_lower or r'\begin{' in equation:
-            if r'\begin{' in equation:
-                # Check for matching \end{}
-                begin_matches = re.findall(r'\\begin\{([^}]+)\}', equation)
-                end_matches = re.findall(r'\\end\{([^}]+)\}', equation)
-                
-                if len(begin_matches) != len(end_matches):
-                    return {
-                        'valid': False,
-                        'error': 'Unmatched matrix environment',
-                        'error_type': 'unmatched_environment',
-                        'suggestion': 'Every \\begin{matrix} needs a matching \\end{matrix}',
-                        'user_message': '⚠️ Unmatched matrix environment! Make sure every \\begin{matrix} has an \\end{matrix}.'
-                    }
-        
-        # GENERAL SYNTAX VALIDATION
+        return None
+    
+    def _validate_general(self, equation: str, char_counts: Counter) -> Optional[Dict[str, Any]]:
+        """Checks for every input: empty, doubled operators, unexpected characters"""
         # Check for empty equation
         if not equation.strip():
             return {
@@ -214,7 +683,7 @@ class FastMathSolver:
             }
         
         # Check for multiple consecutive operators
-        if re.search(r'[+\-*/^]{2,}', equation.replace('**', '').replace('--', '')):
+        if _RE_CONSECUTIVE_OPS.search(equation.replace('**', '').replace('--', '')):
             return {
                 'valid': False,
                 'error': 'Multiple consecutive operators',
@@ -225,12 +694,20 @@ class FastMathSolver:
         
         # Check for invalid characters (after basic LaTeX patterns)
         # Allow: letters, numbers, basic math operators, LaTeX commands, Greek letters, subscripts, superscripts
-        cleaned_check = equation
-        # Remove common LaTeX patterns
-        cleaned_check = re.sub(r'\\[a-zA-Z]+', '', cleaned_check)  # Remove LaTeX commands
-        # Allow standard characters + Unicode math symbols + superscripts/subscripts
-        # Superscripts: ⁰¹²³⁴⁵⁶⁷⁸⁹ⁿ  Subscripts: ₀₁₂₃₄₅₆₇₈₉
-        cleaned_check = re.sub(r'[a-zA-Z0-9\s+\-*/^(){}[\]_.,=<>!|√∫∞×÷≠≤≥πθαβγδεζηικλμνξοπρστυφχψωΓΔΘΛΞΠΣΥΦΨΩ⁰¹²³⁴⁵⁶⁷⁸⁹ⁿ₀₁₂₃₄₅₆₇₈₉→]', '', cleaned_check)
+        # Skip the regex passes when every character is already whitelisted
+        if all(ch in _ALLOWED_CHARS or ch.isspace() for ch in char_counts):
+            cleaned_check = ''
+        else:
+            cleaned_check = equation
+            # Remove common LaTeX patterns
+            cleaned_check = _RE_LATEX_COMMAND.sub('', cleaned_check)  # Remove LaTeX commands
+            # Allow standard characters + Unicode math symbols + superscripts/subscripts
+            # Superscripts: ⁰¹²³⁴⁵⁶⁷⁸⁹ⁿ  Subscripts: ₀₁₂₃₄₅₆₇₈₉
+            if cleaned_check.isascii():
+                # Byte-table delete; no per-character regex class test
+                cleaned_check = cleaned_check.encode('ascii').translate(None, _ALLOWED_ASCII_BYTES).decode('ascii')
+            else:
+                cleaned_check = _RE_ALLOWED_CHARS.sub('', cleaned_check)
         
         if cleaned_check.strip():
             # Has unexpected characters
@@ -243,8 +720,15 @@ class FastMathSolver:
                 'user_message': f'⚠️ Unexpected characters found: {unexpected}. Please use standard math notation.'
             }
         
-        # All validations passed
-        return {'valid': True}
+        return None
+    
+    _VALIDATORS = {
+        'integral': _validate_integral,
+        'derivative': _validate_derivative,
+        'limit': _validate_limit,
+        'equation': _validate_equation_syntax,
+        'matrix': _validate_matrix,
+    }
     
     def solve_equation(self, equation: str, solve_for_var: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -257,6 +741,10 @@ class FastMathSolver:
         Returns:
             Dict with solutions formatted as "variable = value"
         """
+        return _copy_result(self._solve_equation_cached(equation, solve_for_var))
+    
+    def _solve_equation_uncached(self, equation: str, solve_for_var: Optional[str] = None) -> Dict[str, Any]:
+        """Body of solve_equation; results are shared through _solve_equation_cached"""
         try:
             # Validate equation first
             validation = self._validate_equation(equation, 'equation')
@@ -276,7 +764,7 @@ class FastMathSolver:
             equation = self._clean_latex(equation)
             
             # Check for division by zero BEFORE parsing
-            if '/0' in equation.replace(' ', ''):
+            if _RE_DIV_ZERO.search(equation):
                 return {
                     'success': False,
                     'error': 'Division by zero',
@@ -295,33 +783,17 @@ class FastMathSolver:
                         'explanation': f"All values except {parts[1].strip()}"
                     }
             
-            if '<=' in equation or '>=' in equation or '<' in equation or '>' in equation:
+            ineq_match = _RE_INEQUALITY.search(equation)
+            if ineq_match:
                 # Inequality solving
                 try:
                     # Try to solve as inequality
-                    from sympy import solve_univariate_inequality
-                    
-                    # Parse inequality
-                    if '<=' in equation:
-                        left, right = equation.split('<=')
-                        expr = self._parse(left.strip()) - self._parse(right.strip())
-                        var = list(expr.free_symbols)[0] if expr.free_symbols else x
-                        result = solve_univariate_inequality(expr <= 0, var, relational=False)
-                    elif '>=' in equation:
-                        left, right = equation.split('>=')
-                        expr = self._parse(left.strip()) - self._parse(right.strip())
-                        var = list(expr.free_symbols)[0] if expr.free_symbols else x
-                        result = solve_univariate_inequality(expr >= 0, var, relational=False)
-                    elif '<' in equation:
-                        left, right = equation.split('<')
-                        expr = self._parse(left.strip()) - self._parse(right.strip())
-                        var = list(expr.free_symbols)[0] if expr.free_symbols else x
-                        result = solve_univariate_inequality(expr < 0, var, relational=False)
-                    else:  # '>' in equation
-                        left, right = equation.split('>')
-                        expr = self._parse(left.strip()) - self._parse(right.strip())
-                        var = list(expr.free_symbols)[0] if expr.free_symbols else x
-                        result = solve_univariate_inequality(expr > 0, var, relational=False)
+                    # Parse inequality around the first operator found
+                    left, right = equation[:ineq_match.start()], equation[ineq_match.end():]
+                    relation = _INEQUALITY_OPS[ineq_match.group()]
+                    expr = self._parse(left.strip()) - self._parse(right.strip())
+                    var = _first_symbol(expr)
+                    result = solve_univariate_inequality(relation(expr, 0), var, relational=False)
                     
                     return {
                         'success': True,
@@ -349,7 +821,7 @@ class FastMathSolver:
             
             # Determine variable
             if solve_for_var:
-                var = symbols(solve_for_var, real=True)
+                var = _sym(solve_for_var, real=True)
                 solutions = solve(expr, var)
             else:
                 # Auto-detect variable (fast)
@@ -357,8 +829,8 @@ class FastMathSolver:
                 if len(free_vars) == 1:
                     var = free_vars[0]
                     # For Abs, assume real
-                    if 'Abs' in str(expr):
-                        var_real = symbols(str(var), real=True)
+                    if expr.has(Abs):
+                        var_real = _sym(str(var), real=True)
                         expr_real = expr.subs(var, var_real)
                         solutions = solve(expr_real, var_real)
                     else:
@@ -442,25 +914,30 @@ class FastMathSolver:
             # Final result
             result = uv - remaining_integral
             
+            # Render each expression once; the steps reuse the same strings
+            u_tex, du_tex, dv_tex, v_tex, uv_tex, v_du_tex, remaining_tex, result_tex = map(
+                latex, (u, du, dv, v, uv, v_du, remaining_integral, result)
+            )
+            
             return {
                 'success': True,
                 'type': 'integration_by_parts',
-                'u': latex(u),
-                'du': latex(du),
-                'dv': latex(dv),
-                'v': latex(v),
-                'uv': latex(uv),
-                'v_du': latex(v_du),
-                'remaining_integral': latex(remaining_integral),
-                'result': latex(result) + ' + C',
+                'u': u_tex,
+                'du': du_tex,
+                'dv': dv_tex,
+                'v': v_tex,
+                'uv': uv_tex,
+                'v_du': v_du_tex,
+                'remaining_integral': remaining_tex,
+                'result': result_tex + ' + C',
                 'steps': [
-                    f"Let u = {latex(u)}, then du = {latex(du)} d{var}",
-                    f"Let dv = {latex(dv)} d{var}, then v = {latex(v)}",
+                    f"Let u = {u_tex}, then du = {du_tex} d{var}",
+                    f"Let dv = {dv_tex} d{var}, then v = {v_tex}",
                     f"Using ∫u dv = uv - ∫v du:",
-                    f"= {latex(uv)} - ∫({latex(v)})({latex(du)}) d{var}",
-                    f"= {latex(uv)} - ∫{latex(v_du)} d{var}",
-                    f"= {latex(uv)} - ({latex(remaining_integral)})",
-                    f"= {latex(result)} + C"
+                    f"= {uv_tex} - ∫({v_tex})({du_tex}) d{var}",
+                    f"= {uv_tex} - ∫{v_du_tex} d{var}",
+                    f"= {uv_tex} - ({remaining_tex})",
+                    f"= {result_tex} + C"
                 ]
             }
         except Exception as e:
@@ -494,9 +971,9 @@ class FastMathSolver:
                 u = substitution_var
                 du = diff(u, var)
                 # Transform integrand
-                new_integrand = integrand.subs(u, symbols('u_sub'))
-                result = integrate(new_integrand, symbols('u_sub'))
-                final_result = result.subs(symbols('u_sub'), u)
+                new_integrand = integrand.subs(u, _sym('u_sub'))
+                result = integrate(new_integrand, _sym('u_sub'))
+                final_result = result.subs(_sym('u_sub'), u)
                 
                 return {
                     'success': True,
@@ -520,9 +997,7 @@ class FastMathSolver:
             
             partials = {}
             for var_str in variables:
-                var = symbols(var_str)
-                partial = diff(expr, var)
-                partials[var_str] = latex(partial)
+                partials[var_str] = latex(diff(expr, _sym(var_str)))
             
             return {
                 'success': True,
@@ -534,6 +1009,14 @@ class FastMathSolver:
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
+    def numeric_evaluator(self, expr_str: str, variables: List[str]):
+        """
+        Numeric callable for an expression, e.g. a partial derivative or a
+        truncated Taylor series. Kept out of the result dicts, which must stay
+        JSON-serializable; built only when a caller asks for it.
+        """
+        return _fast_callable(self._parse(expr_str), tuple(_sym(var_str) for var_str in variables))
+    
     def implicit_differentiation(self, equation_str: str, y_var: str = 'y', x_var: str = 'x') -> Dict[str, Any]:
         """
         Perform implicit differentiation
@@ -549,14 +1032,14 @@ class FastMathSolver:
                 left_expr = self._parse(equation)
                 right_expr = 0
             
-            x_sym = symbols(x_var)
+            x_sym = _sym(x_var)
             y_sym = Function(y_var)(x_sym)
             
             # Replace y with y(x) for implicit differentiation
             expr = left_expr - right_expr
             
             # Differentiate both sides
-            diff_expr = diff(expr.subs(symbols(y_var), y_sym), x_sym)
+            diff_expr = diff(expr.subs(_sym(y_var), y_sym), x_sym)
             
             # Solve for dy/dx
             dydx = symbols(f'd{y_var}/d{x_var}')
@@ -582,7 +1065,7 @@ class FastMathSolver:
         """
         try:
             expr = self._parse(expr_str)
-            var_sym = symbols(var)
+            var_sym = _sym(var)
             
             series_expansion = series(expr, var_sym, point, order)
             
@@ -629,8 +1112,8 @@ class FastMathSolver:
         Examples: dy/dx = x, d²y/dx² + y = 0
         """
         try:
-            y_func = Function(func)(symbols(var))
-            var_sym = symbols(var)
+            y_func = Function(func)(_sym(var))
+            var_sym = _sym(var)
             
             # Parse the ODE
             equation = self._clean_latex(equation_str)
@@ -668,6 +1151,25 @@ class FastMathSolver:
             except:
                 return {'success': False, 'error': str(e)}
     
+    def _derivative_result(self, expr, var) -> Dict[str, Any]:
+        """Differentiate expr by var and build the derivative response"""
+        result = diff(expr, var)
+        
+        expr_tex, result_tex = map(latex, (expr, result))
+        
+        return {
+            'success': True,
+            'type': 'derivative',
+            'expression': expr_tex,
+            'variable': str(var),
+            'result': result_tex,
+            'steps': [
+                f"Differentiate {expr_tex} with respect to {var}",
+                f"Apply differentiation rules",
+                f"d/d{var}({expr_tex}) = {result_tex}"
+            ]
+        }
+    
     def solve_calculus(self, equation: str, operation: str = 'auto') -> Dict[str, Any]:
         """
         Solve calculus problems: derivatives, integrals, limits, series
@@ -679,16 +1181,13 @@ class FastMathSolver:
             - "\\lim_{x\\to 0} \\frac{\\sin(x)}{x}" → 1
             - "\\int x\\cos(x)dx" → Integration by parts (auto-detected)
         """
+        return _copy_result(self._solve_calculus_cached(equation, operation))
+    
+    def _solve_calculus_uncached(self, equation: str, operation: str = 'auto') -> Dict[str, Any]:
+        """Body of solve_calculus; results are shared through _solve_calculus_cached"""
         try:
             # Validate based on operation type
-            if r'\int' in equation or '∫' in equation or 'integrate' in equation.lower():
-                validation = self._validate_equation(equation, 'integral')
-            elif 'd/d' in equation or r'\frac{d' in equation or 'derivative' in equation.lower():
-                validation = self._validate_equation(equation, 'derivative')
-            elif r'\lim' in equation or 'lim' in equation.lower() or 'limit' in equation.lower():
-                validation = self._validate_equation(equation, 'limit')
-            else:
-                validation = self._validate_equation(equation, 'general')
+            validation = self._validate_equation(equation, _calculus_operation(equation))
             
             if not validation['valid']:
                 return {
@@ -706,98 +1205,60 @@ class FastMathSolver:
             # This must happen before regex matching
             original_equation = equation
             equation = self._convert_unicode_to_latex(equation)
+            markers = _calculus_markers(equation)
             
             # Check for LIMITS first (before cleaning destroys \lim pattern)
             # Patterns: \lim_{x\to 0} expr, lim x→0 expr, limit(expr, x, 0)
-            limit_patterns = [
-                r'\\lim_\{([a-z])\s*\\to\s*([^}]+)\}\s*(.+)',  # \lim_{x\to 0} expr
-                r'lim\s+([a-z])\s*→\s*(\S+)\s+(.+)',            # lim x→0 expr  
-                r'limit\s*\(\s*(.+?)\s*,\s*([a-z])\s*,\s*(.+?)\s*\)',  # limit(expr, x, 0)
-                r'\\lim_\{([a-z])\\to\s*([^}]+)\}\s*(.+)',     # \lim_{x\to 0} (no space)
-            ]
-            
-            for pattern in limit_patterns:
-                limit_match = re.search(pattern, equation, re.DOTALL)
-                if limit_match:
-                    groups = limit_match.groups()
-                    # Different patterns have different group orders
-                    if 'limit(' in pattern:
-                        # limit(expr, x, 0) format
-                        expr_str, var_str, point_str = groups
-                    else:
-                        # \lim_{x\to point} expr format
-                        var_str, point_str, expr_str = groups
-                    
-                    # Clean each component
-                    expr_str = self._clean_latex(expr_str.strip())
-                    point_str = self._clean_latex(point_str.strip())
-                    
-                    # Parse
-                    expr = self._parse(expr_str)
-                    var = symbols(var_str)
-                    
-                    # Handle infinity: "oo" or "∞" or "inf"
-                    if 'oo' in point_str or '∞' in point_str or 'inf' in point_str.lower():
-                        point = oo
-                    else:
-                        point = self._parse(point_str)
-                    
-                    # Compute limit
-                    result = limit(expr, var, point)
-                    
-                    return {
-                        'success': True,
-                        'type': 'limit',
-                        'expression': latex(expr),
-                        'variable': str(var),
-                        'point': latex(point),
-                        'result': latex(result),
-                        'steps': [
-                            f"Compute lim({latex(expr)}) as {var} → {latex(point)}",
-                            f"Result: {latex(result)}"
-                        ]
-                    }
+            limit_match = _first_match(_LIMIT_PATTERNS, equation) if 'limit' in markers else None
+            if limit_match:
+                var_str, point_str, expr_str = limit_match.group('var', 'point', 'expr')
+                
+                # Clean each component
+                expr_str = self._clean_latex(expr_str.strip())
+                point_str = self._clean_latex(point_str.strip())
+                
+                # Parse
+                expr = self._parse(expr_str)
+                var = _sym(var_str)
+                
+                # Handle infinity: "oo" or "∞" or "inf"
+                if 'oo' in point_str or '∞' in point_str or 'inf' in point_str.lower():
+                    point = oo
+                else:
+                    point = self._parse_point(point_str)
+                
+                # Compute limit
+                result = limit(expr, var, point)
+                
+                expr_tex, point_tex, result_tex = map(latex, (expr, point, result))
+                
+                return {
+                    'success': True,
+                    'type': 'limit',
+                    'expression': expr_tex,
+                    'variable': str(var),
+                    'point': point_tex,
+                    'result': result_tex,
+                    'steps': [
+                        f"Compute lim({expr_tex}) as {var} → {point_tex}",
+                        f"Result: {result_tex}"
+                    ]
+                }
 
             # Early DERIVATIVE detection (before cleaning alters \frac or other notation)
             # Handle formats: d/dx(expr), \frac{d}{dx}(expr) and variants
-            if 'd/d' in equation or r'\frac{d' in equation or 'derivative' in equation.lower():
-                # Pattern A: d/dx(expr) or d/dx expr
-                match = re.search(r'd/d([a-zA-Z])\s*\((.+)\)', equation)
-                if not match:
-                    match = re.search(r'd/d([a-zA-Z])\s+(.+)', equation)
-
-                # Pattern B: \frac{d}{dx}(expr) or \frac{d}{dx} expr
-                if not match:
-                    match = re.search(r'\\frac\{d\}\{d([a-zA-Z])\}\s*\((.+)\)', equation)
-                    if not match:
-                        match = re.search(r'\\frac\{d\}\{d([a-zA-Z])\}\s+(.+)', equation)
-
+            if 'derivative' in markers:
+                match = _first_match(_DERIVATIVE_PATTERNS, equation)
                 if match:
-                    var_str, expr_str = match.groups()
                     try:
                         # Clean only the expression part, leave derivative notation intact
-                        expr_clean = self._clean_latex(expr_str.strip())
-                        expr = self._parse(expr_clean)
-                        var = symbols(var_str)
-                        result = diff(expr, var)
-
-                        return {
-                            'success': True,
-                            'type': 'derivative',
-                            'expression': latex(expr),
-                            'variable': str(var),
-                            'result': latex(result),
-                            'steps': [
-                                f"Differentiate {latex(expr)} with respect to {var}",
-                                f"Apply differentiation rules",
-                                f"d/d{var}({latex(expr)}) = {latex(result)}"
-                            ]
-                        }
+                        expr_clean = self._clean_latex(match.group('expr').strip())
+                        return self._derivative_result(self._parse(expr_clean), _sym(match.group('var')))
                     except Exception as e:
                         return {'success': False, 'error': str(e)}
             
             # Check for definite integral (before any other processing)
-            definite_match = re.search(r'\\int_\{([^}]+)\}\^\{([^}]+)\}\s*(.+?)\s+d([a-z])', equation)
+            definite_match = _RE_DEFINITE_INTEGRAL.search(equation) if 'integral' in markers else None
             if definite_match:
                 lower_str, upper_str, integrand_str, var_str = definite_match.groups()
                 
@@ -807,179 +1268,95 @@ class FastMathSolver:
                 integrand_str = self._clean_latex(integrand_str)
                 
                 # Parse
-                lower_val = self._parse(lower_str)
-                upper_val = self._parse(upper_str)
+                lower_val = self._parse_point(lower_str)
+                upper_val = self._parse_point(upper_str)
                 integrand = self._parse(integrand_str)
-                var = symbols(var_str)
+                var = _sym(var_str)
                 
-                # Compute definite integral
-                result = integrate(integrand, (var, lower_val, upper_val))
+                # Compute the antiderivative once; for polynomials (continuous everywhere)
+                # the definite value follows from it, otherwise let SymPy handle the bounds
+                antiderivative = integrate(integrand, var)
+                finite_bounds = not (lower_val.has(oo, -oo, zoo) or upper_val.has(oo, -oo, zoo))
+                if finite_bounds and integrand.is_polynomial(var):
+                    result = antiderivative.subs(var, upper_val) - antiderivative.subs(var, lower_val)
+                else:
+                    result = integrate(integrand, (var, lower_val, upper_val))
+                
+                # Render each expression once; the steps reuse the same strings
+                integrand_tex, lower_tex, upper_tex, result_tex, antiderivative_tex = map(
+                    latex, (integrand, lower_val, upper_val, result, antiderivative)
+                )
                 
                 return {
                     'success': True,
                     'type': 'definite_integral',
-                    'integrand': latex(integrand),
+                    'integrand': integrand_tex,
                     'variable': str(var),
-                    'limits': f"[{latex(lower_val)}, {latex(upper_val)}]",
-                    'result': latex(result),
+                    'limits': f"[{lower_tex}, {upper_tex}]",
+                    'result': result_tex,
                     'steps': [
-                        f"Evaluate ∫ {latex(integrand)} d{var} from {latex(lower_val)} to {latex(upper_val)}",
-                        f"Antiderivative: {latex(integrate(integrand, var))}",
-                        f"Apply limits: {latex(result)}"
+                        f"Evaluate ∫ {integrand_tex} d{var} from {lower_tex} to {upper_tex}",
+                        f"Antiderivative: {antiderivative_tex}",
+                        f"Apply limits: {result_tex}"
                     ]
                 }
             
             # Detect indefinite integral BEFORE full cleaning (to preserve dx pattern)
-            if r'\int' in equation or 'integrate' in equation.lower():
-                match = re.search(r'\\int\s*(.+?)\s*d([a-z])', equation)
+            if 'integral' in markers:
+                match = _RE_INDEFINITE_INTEGRAL.search(equation)
                 if match:
                     integrand_str, var_str = match.groups()
                     # Now clean the integrand
                     integrand_str = self._clean_latex(integrand_str)
                     integrand = self._parse(integrand_str)
-                    var = symbols(var_str)
+                    var = _sym(var_str)
                     
                     # Detect if integration by parts is needed
                     # Products like x*cos(x), x*sin(x), x*exp(x), x*log(x), etc.
-                    needs_ibp = False
-                    u_part = None
-                    dv_part = None
-                    
-                    # Check if integrand is a product that needs integration by parts
-                    if integrand.is_Mul:
-                        args = integrand.args
-                        # Look for polynomial * trig/exp/log
-                        for i, arg in enumerate(args):
-                            if arg.has(var):
-                                # Polynomial part (like x, x^2, etc.)
-                                if arg.is_Poly or arg.is_polynomial(var) or arg.is_Symbol:
-                                    u_part = arg
-                                    # dv is the rest
-                                    dv_part = integrand / arg
-                                    needs_ibp = True
-                                    break
-                                # Or if we have x * (trig/exp/log function)
-                                elif any(func in str(arg) for func in ['sin', 'cos', 'exp', 'log']):
-                                    dv_part = arg
-                                    u_part = integrand / arg
-                                    needs_ibp = True
-                                    break
-                    
-                    # Also check for specific patterns like x*cos(x), x*sin(x), etc.
-                    integrand_str_check = str(integrand).lower()
-                    if any(pattern in integrand_str_check for pattern in ['*cos', '*sin', '*exp', '*log']):
-                        if not needs_ibp:
-                            # Try to split: find the polynomial part
-                            if integrand.is_Mul:
-                                poly_parts = []
-                                func_parts = []
-                                for arg in integrand.args:
-                                    if arg.is_polynomial(var) or arg.is_Symbol or arg.is_number:
-                                        poly_parts.append(arg)
-                                    else:
-                                        func_parts.append(arg)
-                                
-                                if poly_parts and func_parts:
-                                    u_part = Mul(*poly_parts)
-                                    dv_part = Mul(*func_parts)
-                                    needs_ibp = True
-                    
-                    # Apply integration by parts if detected
-                    if needs_ibp and u_part and dv_part:
-                        ibp_result = self.integrate_by_parts(u_part, dv_part, var)
+                    ibp_split = _ibp_split(integrand, var)
+                    if ibp_split is not None:
+                        ibp_result = self.integrate_by_parts(*ibp_split, var)
                         if ibp_result.get('success'):
                             return ibp_result
                     
                     # Regular indefinite integral
                     result = integrate(integrand, var)
                     
+                    integrand_tex, result_tex = map(latex, (integrand, result))
+                    
                     return {
                         'success': True,
                         'type': 'indefinite_integral',
-                        'integrand': latex(integrand),
+                        'integrand': integrand_tex,
                         'variable': str(var),
-                        'result': latex(result) + ' + C',
+                        'result': result_tex + ' + C',
                         'steps': [
-                            f"Integrate {latex(integrand)} with respect to {var}",
+                            f"Integrate {integrand_tex} with respect to {var}",
                             f"Apply power rule and integration formulas",
-                            f"Result: {latex(result)} + C"
+                            f"Result: {result_tex} + C"
                         ]
                     }
             
             # Now clean for other operations
             equation = self._clean_latex(equation)
+            markers = _calculus_markers(equation)
             
             # Detect derivative
-            if 'd/d' in equation or r'\frac{d' in equation or 'derivative' in equation.lower():
-                # Pattern 1: d/dx(expression)
-                match = re.search(r'd/d([a-z])\s*\((.+)\)$', equation)
-                if not match:
-                    # Try without $ anchor
-                    match = re.search(r'd/d([a-z])\s*\((.+)\)', equation)
-                
-                # Pattern 2: \frac{d}{dx}(expression) or \frac{d}{dx} expression
-                if not match:
-                    match = re.search(r'\\frac\{d\}\{d([a-z])\}\s*\((.+)\)', equation)
-                    if not match:
-                        # Try without parentheses
-                        match = re.search(r'\\frac\{d\}\{d([a-z])\}\s*(.+)', equation)
-                
+            if 'derivative' in markers:
+                match = _first_match(_CLEAN_DERIVATIVE_PATTERNS, equation)
                 if match:
-                    var_str, expr_str = match.groups()
-                    expr = self._parse(expr_str)
-                    var = symbols(var_str)
-                    
-                    result = diff(expr, var)
-                    
-                    return {
-                        'success': True,
-                        'type': 'derivative',
-                        'expression': latex(expr),
-                        'variable': str(var),
-                        'result': latex(result),
-                        'steps': [
-                            f"Differentiate {latex(expr)} with respect to {var}",
-                            f"Apply differentiation rules",
-                            f"d/d{var}({latex(expr)}) = {latex(result)}"
-                        ]
-                    }
+                    return self._derivative_result(self._parse(match.group('expr')), _sym(match.group('var')))
             
             # Detect limit - handle multiple formats
-            if r'\lim' in equation or 'limit' in equation.lower() or '→' in equation or 'lim' in equation.lower():
-                # Try multiple regex patterns
-                var_str = None
-                point_str = None
-                expr_str = None
-                
-                # Pattern 1: \lim_{x\to a} f(x) - Most common LaTeX format
-                match = re.search(r'\\lim_\{([a-z])\s*\\to\s*([^}]+)\}\s*(.+)', equation, re.IGNORECASE | re.DOTALL)
+            if 'limit' in markers or 'arrow' in markers:
+                match = _first_match(_CLEAN_LIMIT_PATTERNS, equation)
                 if match:
-                    var_str, point_str, expr_str = match.groups()
-                
-                # Pattern 2: lim x→a f(x) (Unicode arrow)
-                if not match:
-                    match = re.search(r'lim\s+([a-z])\s*→\s*(\S+)\s+(.+)', equation, re.IGNORECASE | re.DOTALL)
-                    if match:
-                        var_str, point_str, expr_str = match.groups()
-                
-                # Pattern 3: lim_{x->a} f(x) (ASCII arrow)
-                if not match:
-                    match = re.search(r'lim_?\{?([a-z])\s*->\s*([^}]+)\}?\s*(.+)', equation, re.IGNORECASE | re.DOTALL)
-                    if match:
-                        var_str, point_str, expr_str = match.groups()
-                
-                # Pattern 4: limit as x approaches a of f(x)
-                if not match:
-                    match = re.search(r'limit\s+(?:as\s+)?([a-z])\s+(?:approaches|to)\s+(\S+)\s+(?:of\s+)?(.+)', equation, re.IGNORECASE | re.DOTALL)
-                    if match:
-                        var_str, point_str, expr_str = match.groups()
-                
-                if var_str and point_str and expr_str:
-                    var = symbols(var_str)
+                    var_str, point_str, expr_str = match.group('var', 'point', 'expr')
+                    var = _sym(var_str)
                     
                     # Handle special point values
                     point_str = point_str.strip().replace('∞', 'oo').replace('infinity', 'oo')
-                    point = self._parse(point_str)
+                    point = self._parse_point(point_str)
                     
                     # Parse expression - clean it first
                     expr_str = expr_str.strip()
@@ -987,34 +1364,38 @@ class FastMathSolver:
                     
                     result = limit(expr, var, point)
                     
+                    expr_tex, point_tex, result_tex = map(latex, (expr, point, result))
+                    
                     return {
                         'success': True,
                         'type': 'limit',
-                        'expression': latex(expr),
+                        'expression': expr_tex,
                         'variable': str(var),
-                        'point': latex(point),
-                        'result': latex(result),
+                        'point': point_tex,
+                        'result': result_tex,
                         'steps': [
-                            f"Find lim[{var}→{latex(point)}] {latex(expr)}",
+                            f"Find lim[{var}→{point_tex}] {expr_tex}",
                             f"Substitute and simplify",
-                            f"Result: {latex(result)}"
+                            f"Result: {result_tex}"
                         ]
                     }
             
             # Detect series expansion
-            if 'taylor' in equation.lower() or 'series' in equation.lower():
+            if 'series' in markers:
                 # Simple pattern for now
                 expr = self._parse(equation.split('taylor')[0] if 'taylor' in equation.lower() else equation)
                 result = series(expr, x, 0, 6)  # Taylor series around 0, up to x^5
                 
+                expr_tex, result_tex = map(latex, (expr, result))
+                
                 return {
                     'success': True,
                     'type': 'series_expansion',
-                    'expression': latex(expr),
-                    'result': latex(result),
+                    'expression': expr_tex,
+                    'result': result_tex,
                     'steps': [
-                        f"Expand {latex(expr)} as Taylor series",
-                        f"Result: {latex(result)}"
+                        f"Expand {expr_tex} as Taylor series",
+                        f"Result: {result_tex}"
                     ]
                 }
             
@@ -1059,6 +1440,10 @@ class FastMathSolver:
             - "F = G*m1*m2/r^2" (gravitation)
             - "λ = h/p" (de Broglie wavelength)
         """
+        return _copy_result(self._solve_physics_cached(equation, problem_type))
+    
+    def _solve_physics_uncached(self, equation: str, problem_type: str = 'auto') -> Dict[str, Any]:
+        """Body of solve_physics; results are shared through _solve_physics_cached"""
         try:
             # Validate equation
             validation = self._validate_equation(equation, 'equation')
@@ -1076,31 +1461,11 @@ class FastMathSolver:
             
             equation = self._clean_latex(equation)
             
-            # Common physics formulas - map to pre-defined symbols
-            physics_symbols_map = {
-                'v': v, 'u': u, 'a': a, 't': t, 's': symbols('s'), 'r': symbols('r'),
-                'F': F, 'm': m, 'M': M, 'm1': symbols('m1'), 'm2': symbols('m2'),
-                'E': symbols('E_energy'), 
-                'c': c_heat,
-                'g': g_sym, 'h': h, 'G': symbols('G'),
-                'P': P, 'V': V, 'n': n, 'R': R, 'T': T,
-                'W': symbols('W'), 'Q': symbols('Q'),
-                'f': f, 'ω': symbols('omega'), 'ν': symbols('nu'),
-                'λ': lambda_var, 'lambda': lambda_var,
-                'μ': mu_var, 'mu': mu_var,
-                'N': N_force,
-                'I': symbols('I'), 'q': symbols('q'), 'C': symbols('C_capacitance'),
-                'L': symbols('L'), 'B': symbols('B'), 'ε': symbols('epsilon'),
-                'ρ': symbols('rho'), 'σ': symbols('sigma'),
-                'τ': symbols('tau'), 'α': alpha, 'β': beta, 'γ': gamma,
-                'θ': theta, 'φ': phi
-            }
-            
             # Detect specific physics topics
             eq_lower = equation.lower()
             
             # Kinematics equations
-            if any(var in equation for var in ['v', 'u', 'a', 't', 's']) and '=' in equation:
+            if '=' in equation and _RE_KINEMATICS_VAR.search(equation):
                 # Parse and solve
                 if '=' in equation:
                     left, right = equation.split('=', 1)
@@ -1108,10 +1473,12 @@ class FastMathSolver:
                     right_expr = self._parse(right.strip())
                     
                     # Solve for a specific variable
-                    free_vars = list((left_expr - right_expr).free_symbols)
-                    if free_vars:
-                        var = free_vars[0]
-                        solutions = solve(Eq(left_expr, right_expr), var)
+                    difference = left_expr - right_expr
+                    var = _first_symbol(difference, None)
+                    if var is not None:
+                        solutions = _linear_solutions(difference, var)
+                        if solutions is None:
+                            solutions = solve(Eq(left_expr, right_expr), var)
                         
                         return {
                             'success': True,
@@ -1171,7 +1538,7 @@ class FastMathSolver:
             # Thermodynamics
             if 'pv' in eq_lower.replace(' ', '') or 'ideal gas' in eq_lower:
                 # PV = nRT
-                result = solve(Eq(P*V, n*R*T), list((P*V - n*R*T).free_symbols)[0] if (P*V - n*R*T).free_symbols else P)
+                result = _ideal_gas_solutions()
                 return {
                     'success': True,
                     'type': 'physics_thermodynamics',
@@ -1183,10 +1550,6 @@ class FastMathSolver:
             # Electricity and Magnetism
             if 'ohm' in eq_lower or ('v' in eq_lower and 'i' in eq_lower and 'r' in eq_lower):
                 # V = IR (Ohm's Law)
-                V_volt = symbols('V_voltage')
-                I_current = symbols('I')
-                R_resistance = symbols('R')
-                
                 return {
                     'success': True,
                     'type': 'physics_electricity',
@@ -1202,10 +1565,12 @@ class FastMathSolver:
                 right_expr = self._parse(right.strip())
                 
                 # Solve for a specific variable
-                free_vars = list((left_expr - right_expr).free_symbols)
-                if free_vars:
-                    var = free_vars[0]
-                    solutions = solve(Eq(left_expr, right_expr), var)
+                difference = left_expr - right_expr
+                var = _first_symbol(difference, None)
+                if var is not None:
+                    solutions = _linear_solutions(difference, var)
+                    if solutions is None:
+                        solutions = solve(Eq(left_expr, right_expr), var)
                     
                     return {
                         'success': True,
@@ -1254,11 +1619,13 @@ class FastMathSolver:
             - Inverse trig functions
             - Trig substitution
         """
+        return _copy_result(self._solve_trigonometry_cached(equation))
+    
+    def _solve_trigonometry_uncached(self, equation: str) -> Dict[str, Any]:
+        """Body of solve_trigonometry; results are shared through _solve_trigonometry_cached"""
         try:
             # Handle sin^2(x) -> sin(x)**2 before cleaning
-            equation = re.sub(r'(sin|cos|tan|sec|csc|cot)\*\*\((\d+)\)', r'\1(x)**\2', equation)
-            equation = re.sub(r'(sin|cos|tan|sec|csc|cot)\^(\d+)', r'\1(x)**\2', equation)
-            equation = re.sub(r'(sin|cos|tan|sec|csc|cot)\^\{(\d+)\}', r'\1(x)**\2', equation)
+            equation = _RE_TRIG_POWER_PREFIX.sub(_expand_trig_power, equation)
             
             equation = self._clean_latex(equation)
             eq_lower = equation.lower()
@@ -1267,7 +1634,7 @@ class FastMathSolver:
             if 'identity' in eq_lower or 'prove' in eq_lower:
                 # Just simplify the expression
                 expr = self._parse(equation.replace('identity', '').replace('prove', '').strip())
-                simplified = trigsimp(expr)
+                simplified = _trigsimp_cached(expr)
                 
                 return {
                     'success': True,
@@ -1307,8 +1674,8 @@ class FastMathSolver:
             else:
                 # Simplify trig expression
                 expr = self._parse(equation)
-                simplified = trigsimp(expr)
-                expanded = expand_trig(expr)
+                simplified = _trigsimp_cached(expr)
+                expanded = _expand_trig_cached(expr)
                 
                 return {
                     'success': True,
@@ -1340,54 +1707,58 @@ class FastMathSolver:
             - "hypothesis testing"
             - "correlation and regression"
         """
+        return _copy_result(self._solve_statistics_cached(equation, problem_type))
+    
+    def _solve_statistics_uncached(self, equation: str, problem_type: str = 'auto') -> Dict[str, Any]:
+        """Body of solve_statistics; results are shared through _solve_statistics_cached"""
         try:
-            equation_lower = equation.lower()
+            equation_lower = _lowercase(equation)
             
             # Detect mean/average
             if 'mean' in equation_lower or 'average' in equation_lower:
                 # Extract numbers
-                numbers = re.findall(r'-?\d+\.?\d*', equation)
-                if numbers:
-                    data = [float(n) for n in numbers]
-                    result = sum(data) / len(data)
+                data = _stat_numbers(equation)
+                if data.size:
+                    total = float(data.sum())
+                    result = total / len(data)
                     
                     return {
                         'success': True,
                         'type': 'mean',
-                        'data': data,
+                        'data': data.tolist(),
                         'result': result,
                         'steps': [
-                            f"Sum of values: {sum(data)}",
+                            f"Sum of values: {total}",
                             f"Count: {len(data)}",
-                            f"Mean = {sum(data)}/{len(data)} = {result}"
+                            f"Mean = {total}/{len(data)} = {result}"
                         ]
                     }
             
             # Detect median
             if 'median' in equation_lower:
-                numbers = re.findall(r'-?\d+\.?\d*', equation)
-                if numbers:
-                    data = sorted([float(n) for n in numbers])
-                    n = len(data)
-                    median = data[n//2] if n % 2 == 1 else (data[n//2-1] + data[n//2]) / 2
+                data = _stat_numbers(equation)
+                if data.size:
+                    data = np.sort(data)
+                    # Already sorted, so read the middle directly instead of np.median's partition
+                    middle = data.size // 2
+                    median = float(data[middle] if data.size % 2 else (data[middle - 1] + data[middle]) / 2)
                     
                     return {
                         'success': True,
                         'type': 'median',
-                        'data': data,
+                        'data': data.tolist(),
                         'result': median,
                         'steps': [
-                            f"Sorted data: {data}",
+                            f"Sorted data: {data.tolist()}",
                             f"Median = {median}"
                         ]
                     }
             
             # Detect mode
             if 'mode' in equation_lower:
-                numbers = re.findall(r'-?\d+\.?\d*', equation)
-                if numbers:
-                    data = [float(n) for n in numbers]
-                    from collections import Counter
+                data = _stat_numbers(equation)
+                if data.size:
+                    data = data.tolist()
                     count = Counter(data)
                     mode = max(count, key=count.get)
                     
@@ -1401,17 +1772,16 @@ class FastMathSolver:
             
             # Detect variance/standard deviation
             if 'variance' in equation_lower or 'std' in equation_lower or 'standard deviation' in equation_lower:
-                numbers = re.findall(r'-?\d+\.?\d*', equation)
-                if numbers:
-                    data = [float(n) for n in numbers]
-                    mean = sum(data) / len(data)
-                    variance_val = sum((x - mean)**2 for x in data) / len(data)
-                    std_dev = variance_val ** 0.5
+                data = _stat_numbers(equation)
+                if data.size:
+                    mean = float(data.mean())
+                    variance_val = float(data.var())  # population variance (divides by n)
+                    std_dev = math.sqrt(variance_val)
                     
                     return {
                         'success': True,
                         'type': 'variance_std',
-                        'data': data,
+                        'data': data.tolist(),
                         'mean': mean,
                         'variance': variance_val,
                         'std_dev': std_dev,
@@ -1426,20 +1796,21 @@ class FastMathSolver:
             # Probability distributions
             if 'binomial' in equation_lower:
                 # Extract n and p
-                n_match = re.search(r'n\s*=\s*(\d+)', equation_lower)
-                p_match = re.search(r'p\s*=\s*(0?\.\d+|\d+\.?\d*)', equation_lower)
+                n_match = _RE_BINOM_N.search(equation_lower)
+                p_match = _RE_BINOM_P.search(equation_lower)
                 
                 if n_match and p_match:
                     n_val = int(n_match.group(1))
                     p_val = float(p_match.group(1))
-                    
-                    X = Binomial('X', n_val, p_val)
+                    if not 0 <= p_val <= 1:
+                        return {'success': False, 'error': 'p should be in range [0, 1].'}
                     
                     # Check for specific probability query
-                    k_match = re.search(r'[xX]\s*=\s*(\d+)', equation)
+                    k_match = _RE_BINOM_K.search(equation)
                     if k_match:
                         k_val = int(k_match.group(1))
-                        prob = density(X).dict[k_val]
+                        # P(X=k) = C(n,k) p^k (1-p)^(n-k); math.comb is 0 for k > n
+                        prob = math.comb(n_val, k_val) * p_val ** k_val * (1 - p_val) ** max(n_val - k_val, 0)
                         
                         return {
                             'success': True,
@@ -1447,28 +1818,28 @@ class FastMathSolver:
                             'n': n_val,
                             'p': p_val,
                             'k': k_val,
-                            'probability': float(prob),
-                            'result': f"P(X={k_val}) = {float(prob):.6f}"
+                            'probability': prob,
+                            'result': f"P(X={k_val}) = {prob:.6f}"
                         }
                     
                     # Return distribution properties
-                    mean = Expectation(X)
-                    var = variance(X)
+                    mean = n_val * p_val
+                    var = mean * (1 - p_val)
                     
                     return {
                         'success': True,
                         'type': 'binomial_distribution',
                         'n': n_val,
                         'p': p_val,
-                        'mean': float(mean),
-                        'variance': float(var),
-                        'std': float(sqrt(var))
+                        'mean': mean,
+                        'variance': var,
+                        'std': math.sqrt(var)
                     }
             
             if 'normal' in equation_lower or 'gaussian' in equation_lower:
                 # Normal distribution
-                mu_match = re.search(r'μ\s*=\s*(-?\d+\.?\d*)|mu\s*=\s*(-?\d+\.?\d*)', equation_lower)
-                sigma_match = re.search(r'σ\s*=\s*(\d+\.?\d*)|sigma\s*=\s*(\d+\.?\d*)', equation_lower)
+                mu_match = _RE_MU.search(equation_lower)
+                sigma_match = _RE_SIGMA.search(equation_lower)
                 
                 mu_val = 0
                 sigma_val = 1
@@ -1488,36 +1859,36 @@ class FastMathSolver:
                 }
             
             # Permutations and Combinations
-            if 'permutation' in equation_lower or 'npr' in equation_lower.replace(' ', '') or re.search(r'\d+\s*P\s*\d+', equation):
-                n_match = re.search(r'(\d+)\s*P\s*(\d+)', equation)
+            if 'permutation' in equation_lower or 'npr' in equation_lower.replace(' ', '') or _RE_PERM.search(equation):
+                n_match = _RE_PERM.search(equation)
                 if n_match:
                     n_val = int(n_match.group(1))
                     r_val = int(n_match.group(2))
-                    result = factorial(n_val) / factorial(n_val - r_val)
+                    result = math.perm(n_val, r_val)
                     
                     return {
                         'success': True,
                         'type': 'permutation',
                         'n': n_val,
                         'r': r_val,
-                        'result': int(result),
-                        'formula': f"P({n_val},{r_val}) = {n_val}!/({n_val}-{r_val})! = {int(result)}"
+                        'result': result,
+                        'formula': f"P({n_val},{r_val}) = {n_val}!/({n_val}-{r_val})! = {result}"
                     }
             
-            if 'combination' in equation_lower or 'ncr' in equation_lower.replace(' ', '') or re.search(r'\d+\s*C\s*\d+', equation):
-                n_match = re.search(r'(\d+)\s*C\s*(\d+)', equation)
+            if 'combination' in equation_lower or 'ncr' in equation_lower.replace(' ', '') or _RE_COMB.search(equation):
+                n_match = _RE_COMB.search(equation)
                 if n_match:
                     n_val = int(n_match.group(1))
                     r_val = int(n_match.group(2))
-                    result = factorial(n_val) / (factorial(r_val) * factorial(n_val - r_val))
+                    result = math.comb(n_val, r_val)
                     
                     return {
                         'success': True,
                         'type': 'combination',
                         'n': n_val,
                         'r': r_val,
-                        'result': int(result),
-                        'formula': f"C({n_val},{r_val}) = {n_val}!/({r_val}!×({n_val}-{r_val})!) = {int(result)}"
+                        'result': result,
+                        'formula': f"C({n_val},{r_val}) = {n_val}!/({r_val}!×({n_val}-{r_val})!) = {result}"
                     }
             
             return {'success': False, 'error': 'Could not identify statistics operation'}
@@ -1541,6 +1912,10 @@ class FastMathSolver:
             - "null space of [[1,2],[3,6]]" - null space
             - "column space, row space, orthogonalize"
         """
+        return _copy_result(self._solve_linear_algebra_cached(equation))
+    
+    def _solve_linear_algebra_uncached(self, equation: str) -> Dict[str, Any]:
+        """Body of solve_linear_algebra; results are shared through _solve_linear_algebra_cached"""
         try:
             # Validate equation
             validation = self._validate_equation(equation, 'matrix')
@@ -1556,19 +1931,26 @@ class FastMathSolver:
                     'original': equation
                 }
             
-            equation_lower = equation.lower()
+            # Every operation below needs a [[...]] matrix literal; without one they would
+            # all fall through, so skip the keyword checks
+            if not _RE_MATRIX.search(equation):
+                return {'success': False, 'error': 'Could not identify linear algebra operation'}
+            
+            equation_lower = _lowercase(equation)
             
             # Helper function to parse matrix
             def parse_matrix_str(matrix_str):
-                matrix_match = re.search(r'\[\[(.*?)\]\]', matrix_str)
+                matrix_match = _RE_MATRIX.search(matrix_str)
                 if matrix_match:
                     matrix_content = matrix_match.group(1)
                     # Parse rows
-                    rows = [row.strip() for row in matrix_content.split('],[')]
-                    matrix_data = []
-                    for row in rows:
-                        row = row.replace('[', '').replace(']', '')
-                        matrix_data.append([self._parse(val.strip()) for val in row.split(',')])
+                    rows = [row.strip().replace('[', '').replace(']', '').split(',')
+                            for row in matrix_content.split('],[')]
+                    if all(_RE_INT_CELL.fullmatch(val) for row in rows for val in row):
+                        # Integer-only matrices (the common case) skip the SymPy parser
+                        matrix_data = [[int(val) for val in row] for row in rows]
+                    else:
+                        matrix_data = [[self._parse(val.strip()) for val in row] for row in rows]
                     return Matrix(matrix_data)
                 return None
             
@@ -1576,14 +1958,19 @@ class FastMathSolver:
             if 'det' in equation_lower or 'determinant' in equation_lower:
                 mat = parse_matrix_str(equation)
                 if mat:
-                    det = mat.det()
+                    domain_mat = _rational_domain_matrix(mat)
+                    if domain_mat is not None:
+                        det = domain_mat.domain.to_sympy(domain_mat.det())
+                    else:
+                        det = mat.det()
+                    mat_tex, det_tex = map(latex, (mat, det))
                     
                     return {
                         'success': True,
                         'type': 'determinant',
-                        'matrix': latex(mat),
-                        'result': latex(det),
-                        'steps': [f"Calculate determinant of {latex(mat)}", f"det = {latex(det)}"]
+                        'matrix': mat_tex,
+                        'result': det_tex,
+                        'steps': [f"Calculate determinant of {mat_tex}", f"det = {det_tex}"]
                     }
             
             # Eigenvalues
@@ -1591,17 +1978,19 @@ class FastMathSolver:
                 mat = parse_matrix_str(equation)
                 if mat:
                     eigenvals = mat.eigenvals()
+                    mat_tex = latex(mat)
+                    eigenvals_tex = {latex(k): v for k, v in eigenvals.items()}
                     
                     return {
                         'success': True,
                         'type': 'eigenvalues',
-                        'matrix': latex(mat),
-                        'eigenvalues': {latex(k): v for k, v in eigenvals.items()},
-                        'result': ', '.join([f"{latex(k)} (multiplicity {v})" for k, v in eigenvals.items()]),
+                        'matrix': mat_tex,
+                        'eigenvalues': eigenvals_tex,
+                        'result': ', '.join([f"{k} (multiplicity {v})" for k, v in eigenvals_tex.items()]),
                         'steps': [
-                            f"Find eigenvalues of {latex(mat)}",
+                            f"Find eigenvalues of {mat_tex}",
                             f"Solve det(A - λI) = 0",
-                            f"Eigenvalues: {', '.join([latex(k) for k in eigenvals.keys()])}"
+                            f"Eigenvalues: {', '.join(eigenvals_tex)}"
                         ]
                     }
             
@@ -1630,16 +2019,17 @@ class FastMathSolver:
                 if mat:
                     try:
                         inv = mat.inv()
+                        mat_tex, inv_tex = map(latex, (mat, inv))
                         
                         return {
                             'success': True,
                             'type': 'matrix_inverse',
-                            'matrix': latex(mat),
-                            'inverse': latex(inv),
-                            'result': latex(inv),
+                            'matrix': mat_tex,
+                            'inverse': inv_tex,
+                            'result': inv_tex,
                             'steps': [
-                                f"Find inverse of {latex(mat)}",
-                                f"A⁻¹ = {latex(inv)}"
+                                f"Find inverse of {mat_tex}",
+                                f"A⁻¹ = {inv_tex}"
                             ]
                         }
                     except:
@@ -1649,24 +2039,26 @@ class FastMathSolver:
                         }
             
             # Transpose
-            if 'transpose' in equation_lower or equation_lower.endswith('t'):
+            if _RE_TRANSPOSE.search(equation_lower):
                 mat = parse_matrix_str(equation)
                 if mat:
                     trans = mat.T
+                    trans_tex = latex(trans)
                     
                     return {
                         'success': True,
                         'type': 'matrix_transpose',
                         'matrix': latex(mat),
-                        'transpose': latex(trans),
-                        'result': latex(trans)
+                        'transpose': trans_tex,
+                        'result': trans_tex
                     }
             
             # Rank
             if 'rank' in equation_lower:
                 mat = parse_matrix_str(equation)
                 if mat:
-                    rank = mat.rank()
+                    domain_mat = _rational_domain_matrix(mat)
+                    rank = domain_mat.rank() if domain_mat is not None else mat.rank()
                     
                     return {
                         'success': True,
@@ -1681,13 +2073,14 @@ class FastMathSolver:
                 mat = parse_matrix_str(equation)
                 if mat:
                     trace = mat.trace()
+                    trace_tex = latex(trace)
                     
                     return {
                         'success': True,
                         'type': 'matrix_trace',
                         'matrix': latex(mat),
-                        'trace': latex(trace),
-                        'result': f"tr(A) = {latex(trace)}"
+                        'trace': trace_tex,
+                        'result': f"tr(A) = {trace_tex}"
                     }
             
             # RREF (Reduced Row Echelon Form)
@@ -1695,65 +2088,66 @@ class FastMathSolver:
                 mat = parse_matrix_str(equation)
                 if mat:
                     rref_mat, pivot_cols = mat.rref()
+                    rref_tex = latex(rref_mat)
                     
                     return {
                         'success': True,
                         'type': 'rref',
                         'matrix': latex(mat),
-                        'rref': latex(rref_mat),
+                        'rref': rref_tex,
                         'pivot_columns': pivot_cols,
-                        'result': latex(rref_mat)
+                        'result': rref_tex
                     }
             
             # Null space (kernel)
             if 'null space' in equation_lower or 'kernel' in equation_lower:
                 mat = parse_matrix_str(equation)
                 if mat:
-                    null = mat.nullspace()
+                    basis = [latex(vec) for vec in mat.nullspace()]
                     
                     return {
                         'success': True,
                         'type': 'null_space',
                         'matrix': latex(mat),
-                        'basis': [latex(vec) for vec in null],
-                        'dimension': len(null),
-                        'result': f"Basis: {{{', '.join([latex(vec) for vec in null])}}}"
+                        'basis': basis,
+                        'dimension': len(basis),
+                        'result': f"Basis: {{{', '.join(basis)}}}"
                     }
             
             # Column space
             if 'column space' in equation_lower or 'columnspace' in equation_lower:
                 mat = parse_matrix_str(equation)
                 if mat:
-                    col_space = mat.columnspace()
+                    basis = [latex(vec) for vec in mat.columnspace()]
                     
                     return {
                         'success': True,
                         'type': 'column_space',
                         'matrix': latex(mat),
-                        'basis': [latex(vec) for vec in col_space],
-                        'dimension': len(col_space),
-                        'result': f"Basis: {{{', '.join([latex(vec) for vec in col_space])}}}"
+                        'basis': basis,
+                        'dimension': len(basis),
+                        'result': f"Basis: {{{', '.join(basis)}}}"
                     }
             
             # Row space
             if 'row space' in equation_lower or 'rowspace' in equation_lower:
                 mat = parse_matrix_str(equation)
                 if mat:
-                    row_space = mat.rowspace()
+                    basis = [latex(vec) for vec in mat.rowspace()]
                     
                     return {
                         'success': True,
                         'type': 'row_space',
                         'matrix': latex(mat),
-                        'basis': [latex(vec) for vec in row_space],
-                        'dimension': len(row_space),
-                        'result': f"Basis: {{{', '.join([latex(vec) for vec in row_space])}}}"
+                        'basis': basis,
+                        'dimension': len(basis),
+                        'result': f"Basis: {{{', '.join(basis)}}}"
                     }
             
             # Matrix multiplication
             if '*' in equation or 'multiply' in equation_lower or 'times' in equation_lower:
                 # Try to find two matrices
-                matrices = re.findall(r'\[\[.*?\]\]', equation)
+                matrices = [m.group() for m in _RE_MATRIX.finditer(equation)]
                 if len(matrices) >= 2:
                     mat1 = parse_matrix_str(matrices[0])
                     mat2 = parse_matrix_str(matrices[1])
@@ -1762,16 +2156,18 @@ class FastMathSolver:
                         try:
                             result = mat1 * mat2
                             
+                            mat1_tex, mat2_tex, result_tex = map(latex, (mat1, mat2, result))
+                            
                             return {
                                 'success': True,
                                 'type': 'matrix_multiplication',
-                                'matrix1': latex(mat1),
-                                'matrix2': latex(mat2),
-                                'result': latex(result),
+                                'matrix1': mat1_tex,
+                                'matrix2': mat2_tex,
+                                'result': result_tex,
                                 'steps': [
-                                    f"A = {latex(mat1)}",
-                                    f"B = {latex(mat2)}",
-                                    f"A × B = {latex(result)}"
+                                    f"A = {mat1_tex}",
+                                    f"B = {mat2_tex}",
+                                    f"A × B = {result_tex}"
                                 ]
                             }
                         except:
@@ -1790,14 +2186,15 @@ class FastMathSolver:
                     
                     try:
                         solution = A.LUsolve(b)
+                        solution_tex = latex(solution)
                         
                         return {
                             'success': True,
                             'type': 'linear_system',
                             'matrix': latex(A),
                             'vector': latex(b),
-                            'solution': latex(solution),
-                            'result': latex(solution)
+                            'solution': solution_tex,
+                            'result': solution_tex
                         }
                     except:
                         return {
@@ -1832,44 +2229,34 @@ class FastMathSolver:
             }
     
     def _parse(self, expr_str: str):
+        """Parse mathematical expression with custom local symbols (memoized)"""
+        return self._parse_cached(expr_str)
+    
+    def _parse_point(self, point_str: str):
+        """Parse a limit point or integration bound, skipping the parser for common values"""
+        point = _COMMON_POINTS.get(point_str)
+        return self._parse(point_str) if point is None else point
+    
+    def _parse_uncached(self, expr_str: str):
         """Parse mathematical expression with custom local symbols"""
         try:
-            # Create a local namespace with our pre-defined symbols
-            # Don't include variable names that will be used for integration/differentiation
-            local_dict = {
-                # Pre-defined symbols (use these when they appear)
-                'theta': theta, 'phi': phi, 'alpha': alpha, 'beta': beta, 'gamma': gamma,
-                # Physics symbols
-                'm': m, 'M': M, 'v': v, 'u': u, 'F': F, 'g': g_sym, 'T': T, 'P': P, 'V': V, 'R': R,
-                'lambda_var': lambda_var, 'mu_var': mu_var, 'N': N_force,
-                'Q': symbols('Q'), 'W': symbols('W'), 's': symbols('s'),
-                'E': symbols('E_energy'), 'c': c_heat, 'nu': symbols('nu'),
-                # Math constants
-                'pi': pi, 'e': E,
-                # Functions
-                'sin': sin, 'cos': cos, 'tan': tan, 'sec': sec, 'csc': csc, 'cot': cot,
-                'arcsin': asin, 'arccos': acos, 'arctan': atan,
-                'sqrt': sqrt, 'log': log, 'exp': exp,
-                'oo': oo  # Infinity
-            }
+            local_dict = self._base_local_dict
             
             # Auto-create subscripted variables (x_1, x_2, y_i, theta_1, etc.)
             # Find all potential subscripted variables in the expression
-            subscript_pattern = r'([a-zA-Z_]+)_([a-zA-Z0-9]+)'
-            subscripted_vars = re.findall(subscript_pattern, expr_str)
-            
-            for base, subscript in subscripted_vars:
-                var_name = f"{base}_{subscript}"
-                if var_name not in local_dict:
-                    # Create symbol with subscript
-                    local_dict[var_name] = symbols(var_name, real=True)
-            
-            transformations = standard_transformations + (implicit_multiplication_application,)
-            return parse_expr(expr_str, transformations=transformations, local_dict=local_dict)
-        except:
+            subscripted_names = {
+                f"{base}_{subscript}" for base, subscript in _RE_SUBSCRIPTED_VAR.findall(expr_str)
+            }.difference(local_dict)
+            if subscripted_names:
+                # Extend a copy; the shared base dict stays untouched
+                local_dict = {**local_dict, **{name: _sym(name, real=True) for name in subscripted_names}}
+            
+            return parse_expr(expr_str, transformations=_TRANSFORMATIONS, local_dict=local_dict)
+        except Exception:
+            # Retry without implicit multiplication, still binding the pre-defined symbols
             try:
                 return sympify(expr_str, locals=local_dict)
-            except:
+            except Exception:
                 return sympify(expr_str)
     
     def _convert_unicode_to_latex(self, text: str) -> str:
@@ -1877,35 +2264,9 @@ class FastMathSolver:
         Convert Unicode math symbols to LaTeX equivalents FIRST
         This must happen before regex pattern matching
         """
-        unicode_to_latex = {
-            '∫': r'\int',      # Integral symbol
-            '∂': r'\partial',  # Partial derivative
-            '∑': r'\sum',      # Summation
-            '∏': r'\prod',     # Product
-            '√': r'\sqrt',     # Square root
-            '∞': r'\infty',    # Infinity
-            '²': '^{2}',       # Superscript 2
-            '³': '^{3}',       # Superscript 3
-            '⁴': '^{4}',       # Superscript 4
-            '⁵': '^{5}',       # Superscript 5
-            '⁶': '^{6}',       # Superscript 6
-            '⁷': '^{7}',       # Superscript 7
-            '⁸': '^{8}',       # Superscript 8
-            '⁹': '^{9}',       # Superscript 9
-            '⁰': '^{0}',       # Superscript 0
-            '≠': '!=',         # Not equal
-            '≤': '<=',         # Less than or equal
-            '≥': '>=',         # Greater than or equal
-            '±': '+-',         # Plus-minus
-            '×': '*',          # Multiplication
-            '÷': '/',          # Division
-            '≈': '=',          # Approximately equal (treat as equal)
-        }
-        
-        for unicode_char, latex_equiv in unicode_to_latex.items():
-            text = text.replace(unicode_char, latex_equiv)
-        
-        return text
+        if text.isascii():
+            return text
+        return _RE_UNICODE_LATEX.sub(_replace_unicode_latex, text)
     
     def _clean_latex(self, text: str) -> str:
         """
@@ -1920,125 +2281,55 @@ class FastMathSolver:
             \\sin(x) -> sin(x)
             \\infty -> oo (SymPy infinity)
         """
+        return self._clean_latex_cached(text)
+    
+    def _clean_latex_uncached(self, text: str) -> str:
+        """Body of _clean_latex; the output depends only on text"""
         # Convert absolute value |x| to Abs(x) FIRST before other conversions
-        text = re.sub(r'\|([^|]+)\|', r'Abs(\1)', text)
-        
-        # Convert Unicode math symbols to LaTeX equivalents
-        unicode_to_latex = {
-            '∫': r'\int',      # Integral symbol
-            '∂': r'\partial',  # Partial derivative
-            '∑': r'\sum',      # Summation
-            '∏': r'\prod',     # Product
-            '√': 'sqrt',       # Square root (convert to function)
-            '∞': r'\infty',    # Infinity
-            '≠': '!=',         # Not equal
-            '≤': '<=',         # Less than or equal
-            '≥': '>=',         # Greater than or equal
-            '±': '+-',         # Plus-minus
-            '×': '*',          # Multiplication
-            '÷': '/',          # Division
-            '≈': '=',          # Approximately equal (treat as equal)
-            'π': 'pi',         # Pi
-            'θ': 'theta',      # Theta
-            'φ': 'phi',        # Phi
-            'α': 'alpha',      # Alpha
-            'β': 'beta',       # Beta
-            'γ': 'gamma',      # Gamma
-            'δ': 'delta',      # Delta
-            'ε': 'epsilon',    # Epsilon
-            'ζ': 'zeta',       # Zeta
-            'η': 'eta',        # Eta
-            'ι': 'iota',       # Iota
-            'κ': 'kappa',      # Kappa
-            'λ': 'lambda_var', # Lambda (renamed to avoid keyword)
-            'μ': 'mu_var',     # Mu (renamed to avoid keyword)
-            'ν': 'nu',         # Nu
-            'ξ': 'xi',         # Xi
-            'ο': 'omicron',    # Omicron
-            'ρ': 'rho',        # Rho
-            'σ': 'sigma',      # Sigma
-            'τ': 'tau',        # Tau
-            'υ': 'upsilon',    # Upsilon
-            'χ': 'chi',        # Chi
-            'ψ': 'psi',        # Psi
-            'ω': 'omega',      # Omega
-            # Uppercase Greek
-            'Γ': 'Gamma',
-            'Δ': 'Delta',
-            'Θ': 'Theta',
-            'Λ': 'Lambda',
-            'Ξ': 'Xi',
-            'Π': 'Pi',
-            'Σ': 'Sigma',
-            'Φ': 'Phi',
-            'Ψ': 'Psi',
-            'Ω': 'Omega',
-        }
-        
-        for unicode_char, latex_equiv in unicode_to_latex.items():
-            text = text.replace(unicode_char, latex_equiv)
+        text = _RE_ABS_BARS.sub(r'Abs(\1)', text)
         
-        # Convert \infty to oo (SymPy infinity)
-        text = text.replace(r'\infty', 'oo')
+        # Convert Unicode math symbols (and \infty) in one pass; isascii() is O(1)
+        if not text.isascii() or r'\infty' in text:
+            text = _RE_UNICODE_SYMBOLS.sub(_replace_unicode_symbol, text)
         
         # Handle Python reserved keywords by renaming them
         # lambda -> lambda_var, mu -> mu_var
-        text = re.sub(r'\blambda\b', 'lambda_var', text)
-        text = re.sub(r'\bmu\b', 'mu_var', text)
-        
-        # Handle subscripts BEFORE exponents
-        # Convert x_{1} -> x_1, x_{i} -> x_i, etc.
-        # This preserves subscripts in variable names
-        text = re.sub(r'([a-zA-Z_]+)_{([^}]+)}', r'\1_\2', text)
-        
-        # Remove LaTeX braces from exponents: x^{2} -> x**2
-        text = re.sub(r'\^{([^}]+)}', r'**(\1)', text)
-        text = text.replace('^', '**')
-        
-        # Convert \frac{a}{b} to (a)/(b)
-        text = re.sub(r'\\frac\{([^}]+)\}\{([^}]+)\}', r'((\1)/(\2))', text)
-        
-        # Convert \sqrt{x} to sqrt(x)
-        text = re.sub(r'\\sqrt\{([^}]+)\}', r'sqrt(\1)', text)
-        
-        # Also handle √(x) format from Unicode conversion
-        text = re.sub(r'sqrt\(([^)]+)\)', r'sqrt(\1)', text)  # Normalize
-        
-        # Convert LaTeX trig functions: \sin -> sin, \cos -> cos, etc.
-        trig_funcs = ['sin', 'cos', 'tan', 'sec', 'csc', 'cot', 'arcsin', 'arccos', 'arctan']
-        for func in trig_funcs:
-            text = text.replace(f'\\{func}', func)
-        
-        # Convert \ln to log (natural log in SymPy)
-        text = text.replace(r'\ln', 'log')
-        
-        # Convert \log to log10 or log
-        text = text.replace(r'\log', 'log')
-        
-        # Convert \exp to exp
-        text = text.replace(r'\exp', 'exp')
-        
-        # Convert \cdot to *
-        text = text.replace(r'\cdot', '*')
-        
-        # Convert \times to *
-        text = text.replace(r'\times', '*')
-        
-        # Remove \left and \right
-        text = text.replace(r'\left', '')
-        text = text.replace(r'\right', '')
-        
+        text = _RE_LAMBDA_WORD.sub('lambda_var', text)
+        text = _RE_MU_WORD.sub('mu_var', text)
+
+        # The LaTeX-only rewrites below need a backslash, brace or caret to match.
+        # Checked after the Unicode pass, which can introduce \int, \sum, ...
+        if '\\' in text or '{' in text or '^' in text:
+            # Handle subscripts BEFORE exponents
+            # Convert x_{1} -> x_1, x_{i} -> x_i, etc.
+            # This preserves subscripts in variable names
+            text = _RE_BRACED_SUBSCRIPT.sub(r'\1_\2', text)
+
+            # Remove LaTeX braces from exponents: x^{2} -> x**2
+            text = _RE_BRACED_EXPONENT.sub(r'**(\1)', text)
+            text = text.replace('^', '**')
+
+            # Convert \frac{a}{b} to (a)/(b)
+            text = _RE_FRAC.sub(r'((\1)/(\2))', text)
+
+            # Convert \sqrt{x} to sqrt(x)
+            text = _RE_SQRT_BRACES.sub(r'sqrt(\1)', text)
+
+            # Convert LaTeX function names and operators in one pass:
+            # \sin -> sin, \ln/\log -> log, \cdot/\times -> *, drop \left/\right
+            text = _RE_LATEX_FUNCTIONS.sub(_replace_latex_function, text)
+
         # Add explicit multiplication: 3x -> 3*x, 2y -> 2*y
         # Match: digit followed by letter
-        text = re.sub(r'(\d)([a-zA-Z])', r'\1*\2', text)
+        text = _RE_DIGIT_LETTER.sub(r'\1*\2', text)
         
         # Add multiplication between )(  -> )*(
-        text = re.sub(r'\)\s*\(', r')*(', text)
+        text = _RE_ADJACENT_PARENS.sub(r')*(', text)
         
         # Handle sin^2(x) -> sin(x)**2
         # Pattern: func^digit or func^{digit}
-        text = re.sub(r'(sin|cos|tan|sec|csc|cot)\*\*\((\d+)\)\(', r'\1(\2**', text)
-        text = re.sub(r'(sin|cos|tan|sec|csc|cot)\*\*(\d+)\(', r'\1(', text)  # Temp fix
+        text = _RE_TRIG_POWER_PAREN.sub(r'\1(\2**', text)
+        text = _RE_TRIG_POWER.sub(r'\1(', text)  # Temp fix
         
         # Remove extra spaces
         text = ' '.join(text.split())
@@ -2048,13 +2339,17 @@ class FastMathSolver:
 
 # Global instance to avoid re-initialization
 _fast_solver = None
+_fast_solver_lock = threading.Lock()
 
 
 def get_fast_solver() -> FastMathSolver:
     """Get or create the global fast solver instance"""
     global _fast_solver
     if _fast_solver is None:
-        _fast_solver = FastMathSolver()
+        # Threaded servers can get here concurrently; build the solver only once
+        with _fast_solver_lock:
+            if _fast_solver is None:
+                _fast_solver = FastMathSolver()
     return _fast_solver
 
 
@@ -2094,11 +2389,13 @@ def fast_solve(equation: str, note_type: str = 'algebra') -> Dict[str, Any]:
             equation = equation[1:].strip()
         
         # Strong hints based on symbols (works even if auto-detect misses)
-        lower_eq = equation.lower()
-        has_integral = '\\int' in equation or '∫' in equation
-        has_derivative = 'd/d' in lower_eq or '\\frac{d' in equation or '∂' in equation
-        has_limit = '\\lim' in equation or 'lim' in lower_eq or '→' in equation
-        calculus_hint = has_integral or has_derivative or has_limit
+        # Exact-case markers first; the lowercased copy is only made when none of them hit
+        # (the 'lim' check also covers \lim)
+        calculus_hint = ('\\int' in equation or '∫' in equation or '∂' in equation
+                         or '→' in equation or '\\frac{d' in equation)
+        if not calculus_hint:
+            lower_eq = _lowercase(equation)
+            calculus_hint = 'd/d' in lower_eq or 'lim' in lower_eq
 
         # Auto-detect if not specified or override when we clearly see calculus symbols
         if note_type == 'auto':
@@ -2159,7 +2456,7 @@ def fast_solve(equation: str, note_type: str = 'algebra') -> Dict[str, Any]:
 
 def _detect_type(equation: str) -> str:
     """Auto-detect equation type from content"""
-    eq_lower = equation.lower()
+    eq_lower = _lowercase(equation)
     
     # Calculus keywords (support both LaTeX and Unicode)
     if any(kw in equation for kw in [r'\int', r'\lim', r'\frac{d', '∫', '∂', '∑', '∏']):
@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import io
 import os
@@ -9,11 +10,22 @@ from typing import Optional
 from datetime import datetime
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException
+from fastapi import BackgroundTasks, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from PIL import Image
 
+from debug_logger import is_debug_enabled
+
+try:
+    # Optional: libjpeg-turbo decoding for JPEG uploads (needs the libturbojpeg shared library)
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    _turbojpeg = TurboJPEG()
+except Exception:
+    _turbojpeg = None
+
+_JPEG_MAGIC = b"\xff\xd8\xff"
+
 app = FastAPI(title="TrOCR Math OCR Service", version="0.3.0")
 
 # Create directory for saving images
@@ -47,6 +59,33 @@ _handwriting_rnn = {
 }
 
 MODEL_ID = os.environ.get("TROCR_MODEL", "fhswf/TrOCR_Math_handwritten")
+# /recognize micro-batching: up to OCR_BATCH_SIZE images arriving within OCR_BATCH_WAIT_MS share one generate()
+OCR_BATCH_SIZE = int(os.environ.get("OCR_BATCH_SIZE", "8"))
+OCR_BATCH_WAIT_S = float(os.environ.get("OCR_BATCH_WAIT_MS", "15")) / 1000
+# Set TROCR_COMPILE=1 to torch.compile the model at load (off until benchmarked on the target GPU)
+COMPILE_MODEL = os.environ.get("TROCR_COMPILE", "0") == "1"
+
+
+def _compile_trocr(model, device):
+    """Compile the model's forward in place and warm it up; eager mode is kept if this fails"""
+    import torch  # type: ignore
+
+    if not hasattr(torch, "compile"):
+        return
+    eager_forward = model.forward
+    try:
+        # generate() calls model(...), so compiling forward is what speeds up the decode loop.
+        # The sequence length grows every decoding step and the batcher sends 1..OCR_BATCH_SIZE
+        # images, so shapes are dynamic (no fixed-shape CUDA graphs from mode="reduce-overhead").
+        model.forward = torch.compile(eager_forward, dynamic=True, fullgraph=False)
+        with torch.inference_mode():
+            # Compile for every batch size before serving, not on live requests
+            for batch_size in range(1, OCR_BATCH_SIZE + 1):
+                dummy = torch.zeros(batch_size, 3, 384, 384, device=device, dtype=model.dtype)
+                model.generate(dummy, max_new_tokens=4)
+    except Exception as e:
+        model.forward = eager_forward
+        print(f"[OCR] torch.compile unavailable, using eager mode: {e}")
 
 
 def load_trocr():
@@ -56,10 +95,14 @@ def load_trocr():
     if _trocr["processor"] is None or _trocr["model"] is None:
         try:
             processor = TrOCRProcessor.from_pretrained(MODEL_ID)
-            model = VisionEncoderDecoderModel.from_pretrained(MODEL_ID)
-            model.eval()
             device = "cuda" if torch.cuda.is_available() else "cpu"
+            # GPU: load FP16 weights directly (half the memory traffic in generate); CPU stays FP32
+            dtype = torch.float16 if device == "cuda" else torch.float32
+            model = VisionEncoderDecoderModel.from_pretrained(MODEL_ID, torch_dtype=dtype)
+            model.eval()
             model.to(device)
+            if COMPILE_MODEL:
+                _compile_trocr(model, device)
             _trocr.update({"processor": processor, "model": model, "device": device})
         except Exception as e:
             raise RuntimeError(
@@ -151,7 +194,17 @@ def decode_image(data: str) -> Image.Image:
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid base64: {e}")
     try:
-        img = Image.open(io.BytesIO(binary)).convert("RGB")
+        img = None
+        if _turbojpeg is not None and binary.startswith(_JPEG_MAGIC):
+            try:
+                img = Image.fromarray(_turbojpeg.decode(binary, pixel_format=TJPF_RGB))
+            except Exception:
+                pass  # e.g. CMYK JPEGs, which only PIL converts; fall through
+        if img is None:
+            img = Image.open(io.BytesIO(binary))
+            img.load()  # decode now so corrupt data is still a 400
+            if img.mode != "RGB":
+                img = img.convert("RGB")
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid image: {e}")
     return img
@@ -175,8 +228,73 @@ async def health():
     }
 
 
+def _recognize_batch(images):
+    """Run one generate() over a batch of images; returns the stripped text for each"""
+    processor, model, device = load_trocr()
+    import torch  # type: ignore
+
+    pixel_values = processor(images=images, return_tensors="pt").pixel_values
+    if device == "cuda":
+        pixel_values = pixel_values.to(device, dtype=torch.float16)
+    with torch.inference_mode():
+        generated_ids = model.generate(pixel_values, max_new_tokens=256)
+    return [(text or "").strip() for text in processor.batch_decode(generated_ids, skip_special_tokens=True)]
+
+
+# Created on first use so they bind to the server's running event loop
+_ocr_queue: Optional[asyncio.Queue] = None
+_ocr_worker: Optional[asyncio.Task] = None
+
+
+async def _ocr_batch_worker():
+    """Drain the queue in batches and resolve each request's future"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _ocr_queue.get()]
+        deadline = loop.time() + OCR_BATCH_WAIT_S
+        while len(batch) < OCR_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_ocr_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        try:
+            # Off the event loop so new requests keep queueing while the model runs
+            texts = await asyncio.to_thread(_recognize_batch, [img for img, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), text in zip(batch, texts):
+                if not future.done():
+                    future.set_result(text)
+
+
+async def _enqueue_recognition(img: Image.Image) -> str:
+    """Queue an image for the next batch and wait for its text"""
+    global _ocr_queue, _ocr_worker
+    if _ocr_queue is None:
+        _ocr_queue = asyncio.Queue()
+        _ocr_worker = asyncio.create_task(_ocr_batch_worker())
+    future = asyncio.get_running_loop().create_future()
+    await _ocr_queue.put((img, future))
+    return await future
+
+
+def _save_image(img: Image.Image, filepath: Path):
+    try:
+        img.save(filepath)
+        print(f"[OCR] Saved image to: {filepath}")
+    except Exception as e:
+        print(f"[OCR] Warning: Failed to save image: {e}")
+
+
 @app.post("/recognize", response_model=RecognizeResult)
-async def recognize(req: RecognizeBody):
+async def recognize(req: RecognizeBody, background_tasks: BackgroundTasks):
     try:
         img = decode_image(req.image)
     except HTTPException:
@@ -184,27 +302,14 @@ async def recognize(req: RecognizeBody):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    # Save the image with timestamp
-    try:
+    # Save the image with timestamp once the response is sent; the PNG encode stays off the OCR path
+    if is_debug_enabled('OCR_SAVE_IMAGES'):  # DEBUG_OCR_SAVE_IMAGES in .env
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
         filename = f"equation_{timestamp}.png"
-        filepath = SAVE_DIR / filename
-        img.save(filepath)
-        print(f"[OCR] Saved image to: {filepath}")
-    except Exception as e:
-        print(f"[OCR] Warning: Failed to save image: {e}")
+        background_tasks.add_task(_save_image, img, SAVE_DIR / filename)  # img is only read from here on
 
     try:
-        processor, model, device = load_trocr()
-        import torch  # type: ignore
-
-        pixel_values = processor(images=img, return_tensors="pt").pixel_values
-        if device == "cuda":
-            pixel_values = pixel_values.to(device)
-        with torch.no_grad():
-            generated_ids = model.generate(pixel_values, max_new_tokens=256)
-        text = processor.batch_decode(generated_ids, skip_special_tokens=True)[0]
-        text = (text or "").strip()
+        text = await _enqueue_recognition(img)
         # TrOCR may not output strict LaTeX; we pass through and let the front-end handle.
         confidence = 0.8 if text else 0.0
         
@@ -19,6 +19,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from PIL import Image
 
+try:
+    # Optional: libjpeg-turbo decoding for JPEG uploads (needs the libturbojpeg shared library)
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    _turbojpeg = TurboJPEG()
+except Exception:
+    _turbojpeg = None
+
+_JPEG_MAGIC = b"\xff\xd8\xff"
+
 # Lazy-load Hugging Face TrOCR model
 _trocr = {
     "processor": None,
@@ -223,7 +232,17 @@ def decode_image(data: str) -> Image.Image:
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid base64: {e}")
     try:
-        img = Image.open(io.BytesIO(binary)).convert("RGB")
+        img = None
+        if _turbojpeg is not None and binary.startswith(_JPEG_MAGIC):
+            try:
+                img = Image.fromarray(_turbojpeg.decode(binary, pixel_format=TJPF_RGB))
+            except Exception:
+                pass  # e.g. CMYK JPEGs, which only PIL converts; fall through
+        if img is None:
+            img = Image.open(io.BytesIO(binary))
+            img.load()  # decode now so corrupt data is still a 400
+            if img.mode != "RGB":
+                img = img.convert("RGB")
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid image: {e}")
     return img
@@ -289,7 +308,7 @@ async def recognize(req: RecognizeBody):
         elif device == "cuda":
             pixel_values = pixel_values.to(device)
         
-        with torch.no_grad():
+        with torch.inference_mode():
             # Use cached generation config for faster inference
             gen_config = _trocr.get("gen_config", {"max_new_tokens": 256})
             generated_ids = model.generate(pixel_values, **gen_config)
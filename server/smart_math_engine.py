@@ -3,14 +3,44 @@ Smart Math Engine - Intelligent mathematical solver using SymPy
 Automatically classifies and solves complex equations in calculus, physics, statistics, etc.
 """
 
-import re
 from sympy import *
 from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication_application
+import re  # after the star import, which would otherwise shadow it with sympy's re()
+from fractions import Fraction
+from functools import lru_cache
 import json
 import sys
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from equation_classifier import EquationClassifier
 
+# _clean_latex rewrite rules, compiled once and applied in this order
+_RE_BRACED_EXPONENT = re.compile(r'\^{([^}]+)}')
+_RE_FRAC = re.compile(r'\\frac{([^}]+)}{([^}]+)}')
+_RE_SQRT_BRACES = re.compile(r'\\sqrt{([^}]+)}')
+_RE_DIGIT_LETTER = re.compile(r'(\d)([a-zA-Z])')
+_RE_ADJACENT_PARENS = re.compile(r'\)\s*\(')
+# a*x + b = c with integer a, b, c, on the output of _clean_latex
+_RE_LINEAR_EQUATION = re.compile(
+    r'^\s*([+-]?)\s*(?:(0|[1-9]\d*)\s*\*?\s*)?([a-z])\s*(?:([+-])\s*(0|[1-9]\d*))?\s*=\s*([+-]?(?:0|[1-9]\d*))\s*$'
+)
+
+_TRANSFORMATIONS = standard_transformations + (implicit_multiplication_application,)
+
+
+@lru_cache(maxsize=1024)
+def _parse_cached(expr_str: str):
+    """
+    Parse a cleaned expression; SymPy expressions are immutable, so results are shared.
+    Only in-process users of SmartMathEngine hit this cache: ocr_service starts this
+    module as a new subprocess per request, so there it always starts empty.
+    """
+    try:
+        # Try standard SymPy parsing first
+        return parse_expr(expr_str, transformations=_TRANSFORMATIONS)
+    except:
+        # Fallback to sympify
+        return sympify(expr_str)
+
 
 class SmartMathEngine:
     """
@@ -65,7 +95,7 @@ class SmartMathEngine:
                 }
             else:
                 # SLOW PATH: Auto-detect (only when needed)
-                classification = self.classifier.classify(user_input)
+                classification = self.classifier.classify(user_input).to_dict()
             
             # Route to appropriate solver
             result = self._route_to_solver(classification)
@@ -147,15 +177,7 @@ class SmartMathEngine:
     def _parse_expression(self, expr_str: str):
         """Parse mathematical expression with intelligent transformations"""
         # Clean up LaTeX formatting
-        expr_str = self._clean_latex(expr_str)
-        
-        try:
-            # Try standard SymPy parsing first
-            transformations = standard_transformations + (implicit_multiplication_application,)
-            return parse_expr(expr_str, transformations=transformations)
-        except:
-            # Fallback to sympify
-            return sympify(expr_str)
+        return _parse_cached(self._clean_latex(expr_str))
     
     def _clean_latex(self, text: str) -> str:
         """
@@ -166,81 +188,106 @@ class SmartMathEngine:
             \\frac{a}{b} -> a/b
             \\sqrt{x} -> sqrt(x)
         """
-        import re
-        
-        # Remove LaTeX braces from exponents: x^{2} -> x^2
-        text = re.sub(r'\^{([^}]+)}', r'^\1', text)
-        
-        # Convert \frac{a}{b} to (a)/(b)
-        text = re.sub(r'\\frac{([^}]+)}{([^}]+)}', r'(\1)/(\2)', text)
-        
-        # Convert \sqrt{x} to sqrt(x)
-        text = re.sub(r'\\sqrt{([^}]+)}', r'sqrt(\1)', text)
-        
-        # Convert \cdot to *
-        text = text.replace(r'\cdot', '*')
-        
-        # Convert \times to *
-        text = text.replace(r'\times', '*')
-        
-        # Remove \left and \right
-        text = text.replace(r'\left', '')
-        text = text.replace(r'\right', '')
+        # The LaTeX-only rewrites need a brace or backslash to match; plain OCR text skips them
+        if '{' in text or '\\' in text:
+            # Remove LaTeX braces from exponents: x^{2} -> x^2
+            text = _RE_BRACED_EXPONENT.sub(r'^\1', text)
+
+            # Convert \frac{a}{b} to (a)/(b)
+            text = _RE_FRAC.sub(r'(\1)/(\2)', text)
+
+            # Convert \sqrt{x} to sqrt(x)
+            text = _RE_SQRT_BRACES.sub(r'sqrt(\1)', text)
+
+            # Convert \cdot to *
+            text = text.replace(r'\cdot', '*')
+
+            # Convert \times to *
+            text = text.replace(r'\times', '*')
+
+            # Remove \left and \right
+            text = text.replace(r'\left', '')
+            text = text.replace(r'\right', '')
         
         # Add explicit multiplication: 3x -> 3*x, 2y -> 2*y
         # Match: digit followed by letter
-        text = re.sub(r'(\d)([a-zA-Z])', r'\1*\2', text)
+        text = _RE_DIGIT_LETTER.sub(r'\1*\2', text)
         
         # Add multiplication between )(  -> )*(
-        text = re.sub(r'\)\s*\(', ')*(', text)
+        text = _RE_ADJACENT_PARENS.sub(')*(', text)
         
         # Remove extra spaces
         text = ' '.join(text.split())
         
         return text
     
+    def _solve_linear_fast(self, equation: str, solve_for: Optional[str]) -> Optional[Tuple[str, List[str]]]:
+        """Solve a*x + b = c with integer coefficients without SymPy; returns (variable, solutions) or None"""
+        match = _RE_LINEAR_EQUATION.match(self._clean_latex(equation))
+        if not match:
+            return None
+        coeff_sign, coeff, var, sign, const, rhs = match.groups()
+        if solve_for and solve_for != var:
+            return None
+        a = int(coeff_sign + (coeff or '1'))
+        if a == 0:
+            return None
+        b = int(sign + const) if const else 0
+        value = Fraction(int(rhs) - b, a)
+        if value.denominator == 1:
+            value_latex = str(value.numerator)
+        else:
+            # Same form as latex(Rational(p, q))
+            value_latex = f"{'- ' if value < 0 else ''}\\frac{{{abs(value.numerator)}}}{{{value.denominator}}}"
+        return var, [f"{var} = {value_latex}"]
+
     def _solve_equation(self, equation: str, classification: Dict) -> Dict[str, Any]:
         """Solve algebraic equation"""
         try:
             solve_for = classification['solve_for']
             
-            # Check if equation has '='
-            if '=' in equation:
-                left, right = equation.split('=', 1)
-                left_expr = self._parse_expression(left.strip())
-                right_expr = self._parse_expression(right.strip())
-                expr = Eq(left_expr, right_expr)
+            # Trivial linear forms like 2x + 3 = 7 skip parse_expr/solve entirely
+            fast = self._solve_linear_fast(equation, solve_for)
+            if fast is not None:
+                solve_for, solution_latex = fast
             else:
-                expr = self._parse_expression(equation)
-            
-            if solve_for:
-                var = symbols(solve_for)
-                solutions = solve(expr, var)
-            else:
-                # Auto-detect variable
-                free_vars = list(expr.free_symbols)
-                if len(free_vars) == 1:
-                    var = free_vars[0]
-                    solutions = solve(expr, var)
-                    solve_for = str(var)
+                # Check if equation has '='
+                if '=' in equation:
+                    left, right = equation.split('=', 1)
+                    left_expr = self._parse_expression(left.strip())
+                    right_expr = self._parse_expression(right.strip())
+                    expr = Eq(left_expr, right_expr)
                 else:
-                    solutions = solve(expr)
+                    expr = self._parse_expression(equation)
             
-            # Format solutions with variable name
-            if isinstance(solutions, list):
                 if solve_for:
-                    # Format as "x = value" for each solution
-                    solution_latex = [f"{solve_for} = {latex(sol)}" for sol in solutions]
+                    var = symbols(solve_for)
+                    solutions = solve(expr, var)
                 else:
-                    solution_latex = [latex(sol) for sol in solutions]
-            elif isinstance(solutions, dict):
-                # Format dict solutions as "var = value"
-                solution_latex = [f"{str(k)} = {latex(v)}" for k, v in solutions.items()]
-            else:
-                if solve_for:
-                    solution_latex = [f"{solve_for} = {latex(solutions)}"]
+                    # Auto-detect variable
+                    free_vars = list(expr.free_symbols)
+                    if len(free_vars) == 1:
+                        var = free_vars[0]
+                        solutions = solve(expr, var)
+                        solve_for = str(var)
+                    else:
+                        solutions = solve(expr)
+            
+                # Format solutions with variable name
+                if isinstance(solutions, list):
+                    if solve_for:
+                        # Format as "x = value" for each solution
+                        solution_latex = [f"{solve_for} = {latex(sol)}" for sol in solutions]
+                    else:
+                        solution_latex = [latex(sol) for sol in solutions]
+                elif isinstance(solutions, dict):
+                    # Format dict solutions as "var = value"
+                    solution_latex = [f"{str(k)} = {latex(v)}" for k, v in solutions.items()]
                 else:
-                    solution_latex = [latex(solutions)]
+                    if solve_for:
+                        solution_latex = [f"{solve_for} = {latex(solutions)}"]
+                    else:
+                        solution_latex = [latex(solutions)]
             
             return {
                 'type': 'equation_solution',
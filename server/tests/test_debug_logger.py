@@ -0,0 +1,51 @@
+import importlib
+import os
+
+import pytest
+
+import debug_logger
+
+
+@pytest.fixture
+def reload_logger(monkeypatch, tmp_path):
+    """Reload debug_logger against a private copy of the environment and a temp .env"""
+    environ = {name: value for name, value in os.environ.items()
+               if not name.startswith("DEBUG_") and name not in ("SKIP_DOTENV", "DOTENV_PATH")}
+    monkeypatch.setattr(os, "environ", environ)  # load_dotenv writes here, not the real environment
+
+    def reload(env_file_text, **env):
+        env_file = tmp_path / ".env"
+        env_file.write_text(env_file_text)
+        environ.update(DOTENV_PATH=str(env_file), **env)
+        return importlib.reload(debug_logger)
+
+    yield reload
+    monkeypatch.undo()
+    importlib.reload(debug_logger)
+
+
+def test_env_file_loaded_even_when_a_debug_var_is_set(reload_logger):
+    logger = reload_logger("DEBUG_MATH_SERVER=true\n", DEBUG_ALL="false")
+    assert logger.is_debug_enabled("MATH_SERVER")
+
+
+def test_environment_wins_over_env_file(reload_logger):
+    logger = reload_logger("DEBUG_MATH_SERVER=true\n", DEBUG_MATH_SERVER="false")
+    assert not logger.is_debug_enabled("MATH_SERVER")
+
+
+def test_skip_dotenv(reload_logger):
+    logger = reload_logger("DEBUG_MATH_SERVER=true\n", SKIP_DOTENV="1")
+    assert not logger.is_debug_enabled("MATH_SERVER")
+
+
+def test_debug_flags_still_exported(reload_logger):
+    logger = reload_logger("DEBUG_MATH_SERVER=true\n")
+    assert "DEBUG_FLAGS" in logger.__all__
+    assert logger.DEBUG_FLAGS["MATH_SERVER"] is True
+    assert logger.DEBUG_FLAGS["OCR_SERVER"] is False
+    assert set(logger.DEBUG_FLAGS) == set(logger.DEBUG_CATEGORIES)
+    assert logger.DEBUG_ALL is False
+    namespace = {}
+    exec("from debug_logger import *", namespace)
+    assert namespace["DEBUG_FLAGS"] is logger.DEBUG_FLAGS
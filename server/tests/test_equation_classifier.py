@@ -0,0 +1,59 @@
+import pytest
+
+from equation_classifier import EquationClassifier
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return EquationClassifier()
+
+
+@pytest.mark.parametrize("text", [None, "", "   ", 42, "2x + 3 = 7", "d/dx x^2"])
+def test_classify_batch_matches_classify(classifier, text):
+    assert classifier.classify_batch([text]) == [classifier.classify(text)]
+
+
+def test_classify_batch_keeps_order_and_shares_duplicates(classifier):
+    texts = ["x^2 = 4", "mean of 1, 2, 3", "x^2 = 4"]
+    results = classifier.classify_batch(texts)
+    assert [r.equation for r in results] == texts
+    assert results[0] is results[2]
+
+
+@pytest.mark.parametrize("text", [
+    "2x + 3 = 7",
+    "d/dx x^2",
+    "integrate x^2 dx",
+    "mean of 1, 2, 3",
+    "F = m*a",
+    "determinant [[1,2],[3,4]]",
+    "simplify sin^2(x) + cos^2(x)",
+])
+def test_hyperscan_path_matches_regex_path(classifier, text):
+    if classifier._hs_db is None:
+        pytest.skip("hyperscan not installed")
+    problem_type, operation = classifier._detect_with_hyperscan(text)
+    assert problem_type == classifier._detect_problem_type(text)
+    assert operation == classifier._detect_operation(text)
+
+
+def test_classification_result_is_immutable_and_dict_readable(classifier):
+    import dataclasses
+
+    result = classifier.classify("solve 2x + 3 = 7 for x")
+    assert result["problem_type"] == result.problem_type
+    assert result.get("solve_for") == result.solve_for
+    assert result.get("missing", "default") == "default"
+    with pytest.raises(KeyError):
+        result["missing"]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        result.problem_type = "calculus"
+
+
+def test_to_dict_copy_does_not_touch_the_cached_result(classifier):
+    text = "x^2 + y = 4"
+    as_dict = classifier.classify(text).to_dict()
+    as_dict["problem_type"] = "changed"
+    as_dict["variables"] = ["changed"]
+    assert classifier.classify(text).to_dict() != as_dict
+    assert classifier.classify(text) is classifier.classify(text)
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from fast_math_solver import fast_solve, get_fast_solver
+
+
+@pytest.mark.parametrize("equation, note_type", [
+    ("2x + 5 = 15", "algebra"),
+    ("x^2 - 5x + 6 = 0", "algebra"),
+    (r"\int x^{2}dx", "calculus"),
+    (r"\frac{d}{dx} x^3", "calculus"),
+    ("sin(x) taylor series", "calculus"),
+    ("sin^2(x) + cos^2(x)", "trigonometry"),
+    ("mean of 1, 2, 3, 4", "statistics"),
+    ("variance of 2, 4, 4, 5", "statistics"),
+    ("determinant [[1,2],[3,4]]", "linear_algebra"),
+    ("F = m*a", "physics"),
+])
+def test_fast_solve_result_is_json_serializable(equation, note_type):
+    # The OCR services return these dicts as the API response
+    json.dumps(fast_solve(equation, note_type))
+
+
+def test_partial_derivatives_result_is_json_serializable():
+    result = get_fast_solver().partial_derivatives("x**2*y + x*y**2")
+    assert result["success"]
+    assert result["partials"] == {"x": "2 x y + y^{2}", "y": "x^{2} + 2 x y"}
+    json.dumps(result)
+
+
+def test_taylor_series_result_is_json_serializable():
+    result = get_fast_solver().taylor_series("sin(x)")
+    assert result["success"]
+    json.dumps(result)
+
+
+def test_numeric_evaluator():
+    evaluate = get_fast_solver().numeric_evaluator("x**2*y", ["x", "y"])
+    assert evaluate(2.0, 3.0) == pytest.approx(12.0)
+
+
+@pytest.mark.parametrize("expr_str, expected", [
+    # Inputs where a symengine round-trip used to auto-simplify or change number types
+    ("exp(x)*exp(y)", "e^{x} e^{y}"),
+    ("x * x**n", "x x^{n}"),
+    ("exp(sqrt(-0.5 ** 2))", "e^{0.5 i}"),
+])
+def test_parse_matches_parse_expr(expr_str, expected):
+    from sympy import latex
+
+    assert latex(get_fast_solver()._parse(expr_str)) == expected
+
+
+@pytest.mark.parametrize("equation, variable", [
+    ("F = m*a", "a"),
+    ("v = u + a*t", "a"),
+])
+def test_physics_formula_solves_for_lowercase_unknown(equation, variable):
+    result = fast_solve(equation, "physics")["result"]
+    assert result["variable"] == variable
+
+
+def test_variance_and_std():
+    result = fast_solve("variance of 2, 4, 4, 4, 5, 5, 7, 9", "statistics")["result"]
+    assert result["mean"] == 5.0
+    assert result["variance"] == 4.0
+    assert result["std_dev"] == 2.0
+
+
+def test_cached_linear_algebra_result_is_not_shared():
+    solver = get_fast_solver()
+    equation = "eigenvectors of [[2,1],[1,2]]"
+    first = solver.solve_linear_algebra(equation)
+    expected = repr(first)
+    first["eigenvectors"][0][2][0][0] = 99
+    first["eigenvectors"][0][2].append("junk")
+    assert repr(solver.solve_linear_algebra(equation)) == expected
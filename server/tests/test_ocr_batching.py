@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("PIL")
+
+import ocr_service
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    """Replace the TrOCR call with one that records batch sizes; fresh queue per test"""
+    batches = []
+
+    def recognize_batch(images):
+        batches.append(len(images))
+        if "bad" in images:
+            raise RuntimeError("model failed")
+        return [f"text {image}" for image in images]
+
+    monkeypatch.setattr(ocr_service, "_recognize_batch", recognize_batch)
+    monkeypatch.setattr(ocr_service, "_ocr_queue", None)
+    monkeypatch.setattr(ocr_service, "_ocr_worker", None)
+    monkeypatch.setattr(ocr_service, "OCR_BATCH_SIZE", 8)
+    return batches
+
+
+def test_concurrent_requests_share_batches(fake_model):
+    async def run():
+        return await asyncio.gather(*(ocr_service._enqueue_recognition(i) for i in range(11)))
+
+    assert asyncio.run(run()) == [f"text {i}" for i in range(11)]
+    assert fake_model == [8, 3]
+
+
+def test_batch_failure_reaches_every_waiter(fake_model):
+    async def run():
+        return await asyncio.gather(
+            ocr_service._enqueue_recognition("bad"),
+            ocr_service._enqueue_recognition("ok"),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert fake_model == [2]
+    assert all(isinstance(result, RuntimeError) for result in results)